@@ -8,6 +8,7 @@ from .seat import seat_router
 from .reservation import reservation_router
 from .theatre import theatre_router
 from .reporting import reporting_router
+from .system import system_router
 
 v1_router = APIRouter(prefix="/v1")
 
@@ -19,6 +20,7 @@ v1_router.include_router(seat_router)
 v1_router.include_router(reservation_router)
 v1_router.include_router(theatre_router)
 v1_router.include_router(reporting_router)
+v1_router.include_router(system_router)
 
 
 @v1_router.get("/welcome", tags=["Welcome"], description="Hello world endpoint")
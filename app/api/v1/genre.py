@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth.jwt import ValidateJwt
 from app.core.database.session import get_async_session
-from app.core.schema import AppResponse
+from app.core.schema import AppJSONResponse, AppResponse
 from app.core.pagination import PaginatedResult
 
 from app.services.genre import Genre
@@ -21,8 +21,8 @@ genre_router = APIRouter(
 async def get_genres(
     session: AsyncSession = Depends(get_async_session),
     pagination: Genre.GenrePagination = Query(...),
-) -> AppResponse[PaginatedResult[Genre]]:
-    return AppResponse.create_response(
+) -> AppJSONResponse:
+    return AppResponse.create_json_response(
         await Genre.get_all(session, pagination=pagination)
     )
 
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth.jwt import ValidateJwt
 from app.core.database.session import get_async_session
 from app.core.pagination import PaginatedResult
+from app.core.response_cache import ResponseCache
 from app.core.schema import AppResponse
 
 from app.dto.movie import MovieCreateDto, MovieUpdateDto
 
-from app.domain.movie import MovieWithGenres, MovieBase
+from app.domain.movie import MovieWithGenres, MovieBase, MovieSummary
 
+from app.services.genre import Genre
 from app.services.movie import Movie
 
 from app.constants import UserRoles
@@ -18,22 +20,36 @@ from app.constants import UserRoles
 movie_router = APIRouter(prefix="/movies", tags=["Movies"])
 
 
-@movie_router.get("/", response_model=AppResponse[PaginatedResult[MovieBase]])
+@movie_router.get("/", response_model=AppResponse[PaginatedResult[MovieSummary]])
 async def get_movies(
+    request: Request,
     session: AsyncSession = Depends(get_async_session),
     query: Movie.MoviePagination = Query(...),
-) -> AppResponse[PaginatedResult[MovieBase]]:
-    return AppResponse.create_response(
-        data=await Movie.get_all(session, pagination=query)
+) -> Response:
+    async def producer():
+        return AppResponse.create_response(
+            data=await MovieSummary.get_all(
+                session, pagination=query, trusted=True, projected=True
+            )
+        )
+
+    return await ResponseCache.serve(
+        request, producer, tags=[Movie.CACHE_TAG], query=query
     )
 
 
 @movie_router.get("/{id}", response_model=AppResponse[MovieWithGenres])
 async def get_movie(
+    request: Request,
     id: int,
     session: AsyncSession = Depends(get_async_session),
-) -> AppResponse[MovieWithGenres]:
-    return AppResponse.create_response(await Movie.get_one(session, id))
+) -> Response:
+    async def producer():
+        return AppResponse.create_response(await Movie.get_one(session, id))
+
+    return await ResponseCache.serve(
+        request, producer, tags=[Movie.get_cache_tag(id), Genre.CACHE_TAG]
+    )
 
 
 @movie_router.post(
@@ -1,9 +1,14 @@
+from datetime import date
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants import UserRoles
 from app.core.auth.jwt import ValidateJwt
 from app.core.database.session import get_async_session
+from app.core.export import Exporter
 from app.core.schema import AppResponse
 from app.dto.reporting import RevenueRecord, RevenueType
 from app.services.reporting import Reporting
@@ -19,8 +24,31 @@ reporting_router = APIRouter(prefix="/reporting", tags=["Reporting"])
 )
 async def get_potential_revenue(
     session: AsyncSession = Depends(get_async_session),
-    type: RevenueType = Query(default=RevenueType.REALIZED)
+    type: RevenueType = Query(default=RevenueType.REALIZED),
+    from_date: Optional[date] = Query(default=None, description="First showtime date, inclusive"),
+    to_date: Optional[date] = Query(default=None, description="Last showtime date, inclusive"),
+    theatre_id: Optional[int] = Query(default=None),
 ) -> AppResponse[list[RevenueRecord]]:
     """Get report for either potential or realized revenue"""
-    reporting_result = await Reporting.get_revenue(session, type)
-    return AppResponse.create_response(reporting_result)
\ No newline at end of file
+    reporting_result = await Reporting.get_revenue(
+        session, type, from_date, to_date, theatre_id
+    )
+    return AppResponse.create_response(reporting_result)
+
+
+@reporting_router.get(
+    "/revenue/export",
+    dependencies=[Depends(ValidateJwt(UserRoles.ADMIN))],
+    response_class=StreamingResponse,
+)
+async def export_revenue(
+    query: Reporting.RevenueExport = Query(
+        description="Filter and sort the exported revenue rows",
+    ),
+) -> StreamingResponse:
+    """Stream the revenue per movie, theatre and showtime date as CSV or NDJSON"""
+    return Exporter.stream(
+        Reporting.get_revenue_export_statement(query),
+        format=query.format,
+        filename=f"revenue-{query.type.value.lower()}",
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth.jwt import ValidateJwt
@@ -8,11 +8,20 @@ from app.core.pagination import PaginatedResult
 from app.domain.user import UserBase
 
 from app.services.reservation import Reservation, ReservationCreate, ReservationWithRelations
+from app.dto.reservation import ReservationManyCreate
+from app.dto.attendance import (
+    AttendanceBatchDto,
+    AttendanceIngestResult,
+    ShowtimeCompletionResult,
+)
+from app.services.attendance import Attendance
 
 from app.constants import UserRoles
 
 from app.redis import get_redis_client, RedisClient
-from app.core.schema import AppResponse
+from app.core.schema import AppJSONResponse, AppResponse
+from app.core.export import Exporter
+from fastapi.responses import StreamingResponse
 
 reservation_router = APIRouter(prefix="/reservations", tags=["Reservation"])
 
@@ -42,6 +51,26 @@ async def create_held_reservation(
     )
 
 
+@reservation_router.post(
+    "/hold-seats",
+    response_model=AppResponse[list[ReservationWithRelations]],
+    description="""
+        Hold several seats of the same showtime at once with status HELD:
+
+        Either all seats are held or none of them, the holds expire together.
+    """,
+)
+async def create_held_reservations(
+    data: ReservationManyCreate,
+    session: AsyncSession = Depends(get_async_session),
+    redis_client: RedisClient = Depends(get_redis_client),
+    user: UserBase = Depends(ValidateJwt(UserRoles.REGULAR_USER)),
+) -> AppResponse[list[ReservationWithRelations]]:
+    return AppResponse.create_response(
+        await Reservation.create_held_many(session, data, user.id, redis_client)
+    )
+
+
 @reservation_router.patch(
     "/confirm-seat/{reservation_id:path}",
     response_model=AppResponse[ReservationWithRelations],
@@ -71,9 +100,71 @@ async def update_reservation_confirmed(
 async def update_reservation_no_show(
     reservation_id: int,
     session: AsyncSession = Depends(get_async_session),
+    redis_client: RedisClient = Depends(get_redis_client),
 ) -> AppResponse[ReservationWithRelations]:
     return AppResponse.create_response(
-        await Reservation.update_no_show(session, reservation_id)
+        await Reservation.update_no_show(session, reservation_id, redis_client)
+    )
+
+
+@reservation_router.post(
+    "/attendance/{showtime_id}",
+    summary="Ingest a batch of scanned tickets of a showtime",
+    response_model=AppResponse[AttendanceIngestResult],
+    dependencies=[Depends(ValidateJwt(UserRoles.ADMIN))],
+)
+async def ingest_attendance(
+    showtime_id: int,
+    payload: AttendanceBatchDto,
+    session: AsyncSession = Depends(get_async_session),
+) -> AppResponse[AttendanceIngestResult]:
+    ingested = await Attendance.ingest(
+        session,
+        showtime_id,
+        [(scan.reservation_id, scan.scanned_at) for scan in payload.scans],
+    )
+    return AppResponse.create_response(
+        AttendanceIngestResult(show_time_id=showtime_id, ingested=ingested)
+    )
+
+
+@reservation_router.post(
+    "/attendance/{showtime_id}/csv",
+    summary="Ingest a CSV feed of scanned tickets of a showtime",
+    description="The CSV has a 'reservation_id' column and an optional ISO 8601 'scanned_at' column.",
+    response_model=AppResponse[AttendanceIngestResult],
+    dependencies=[Depends(ValidateJwt(UserRoles.ADMIN))],
+)
+async def ingest_attendance_csv(
+    showtime_id: int,
+    file: UploadFile,
+    session: AsyncSession = Depends(get_async_session),
+) -> AppResponse[AttendanceIngestResult]:
+    ingested = await Attendance.ingest(session, showtime_id, Attendance.read_csv(file))
+    return AppResponse.create_response(
+        AttendanceIngestResult(show_time_id=showtime_id, ingested=ingested)
+    )
+
+
+@reservation_router.post(
+    "/attendance/{showtime_id}/complete",
+    summary="Settle the reservations of a started showtime by its scanned tickets",
+    description="Scanned CONFIRMED reservations become COMPLETE, the others NO_SHOW. Without scans all become COMPLETE.",
+    response_model=AppResponse[ShowtimeCompletionResult],
+    dependencies=[Depends(ValidateJwt(UserRoles.ADMIN))],
+)
+async def complete_showtime(
+    showtime_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    redis_client: RedisClient = Depends(get_redis_client),
+) -> AppResponse[ShowtimeCompletionResult]:
+    counts = await Reservation.complete_showtime(session, showtime_id, redis_client)
+    return AppResponse.create_response(
+        ShowtimeCompletionResult(
+            show_time_id=showtime_id,
+            completed=counts.get(Reservation.Status.COMPLETE, 0),
+            no_show=counts.get(Reservation.Status.NO_SHOW, 0),
+        )
     )
 
 
@@ -84,10 +175,13 @@ async def update_reservation_no_show(
 async def update_reservation_canceled(
     reservation_id: int,
     session: AsyncSession = Depends(get_async_session),
+    redis_client: RedisClient = Depends(get_redis_client),
     user: UserBase = Depends(ValidateJwt(UserRoles.REGULAR_USER)),
 ) -> AppResponse[ReservationWithRelations]:
     return AppResponse.create_response(
-        await Reservation.update_canceled(session, reservation_id, user.id)
+        await Reservation.update_canceled(
+            session, reservation_id, user.id, redis_client
+        )
     )
 
 
@@ -107,6 +201,7 @@ async def get_my_reservations(
             session,
             pagination=pagination,
             where_clause=[Reservation.model.user_id == user.id],
+            trusted=True,
         )
     )
 
@@ -121,7 +216,27 @@ async def get_reservations(
     pagination: Reservation.Pagination = Query(
         description="Paginate your reservations results",
     ),
-) -> AppResponse[PaginatedResult[ReservationWithRelations]]:
-    return AppResponse.create_response(
-        await Reservation.get_all_with_relations(session, pagination=pagination)
+) -> AppJSONResponse:
+    return AppResponse.create_json_response(
+        await Reservation.get_all_with_relations(
+            session, pagination=pagination, trusted=True
+        )
+    )
+
+
+@reservation_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(ValidateJwt(UserRoles.ADMIN))],
+)
+async def export_reservations(
+    query: Reservation.Export = Query(
+        description="Filter and sort the exported reservations",
+    ),
+) -> StreamingResponse:
+    """Stream all the reservations matching the filters as CSV or NDJSON"""
+    return Exporter.stream(
+        Reservation.get_export_statement(query),
+        format=query.format,
+        filename="reservations",
     )
@@ -3,8 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database.session import get_async_session
 
 from app.services.seat import Seat
+from app.redis import get_redis_client, RedisClient
 
-from app.core.schema import AppResponse
+from app.core.schema import AppJSONResponse, AppResponse
 from app.core.pagination import PaginatedResult
 
 
@@ -16,8 +17,9 @@ async def get_seats(
     showtime_id: int = Path(...),
     session: AsyncSession = Depends(get_async_session),
     pagination: Seat.SeatPagination = Query(...),
-) -> AppResponse[PaginatedResult[Seat]]:
+    redis_client: RedisClient = Depends(get_redis_client),
+) -> AppJSONResponse:
     result: PaginatedResult[Seat] = await Seat.get_available_seats_by_showtime(
-        session, showtime_id, pagination
+        session, showtime_id, pagination, redis_client
     )
-    return AppResponse.create_response(data=result)
+    return AppResponse.create_json_response(result)
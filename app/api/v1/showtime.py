@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
 from app.core.auth.jwt import ValidateJwt
 from app.core.database.session import get_async_session
+from app.core.config import settings
 from app.core.pagination import PaginatedResult
-from app.core.schema import AppResponse
+from app.core.response_cache import ResponseCache
+from app.core.schema import AppJSONResponse, AppResponse
+from app.redis import RedisClient, get_redis_client
 
 from app.constants import UserRoles
 
@@ -24,15 +27,21 @@ showtime_router = APIRouter(prefix="/showtimes", tags=["Showtimes"])
     response_model=AppResponse[PaginatedResult[ShowtimeBase]],
 )
 async def get_showtimes_latest(
+    request: Request,
     session: AsyncSession = Depends(get_async_session),
     pagination: ShowtimeBase.Pagination = Query(...),
-) -> AppResponse[PaginatedResult[ShowtimeBase]]:
-    return AppResponse.create_response(
-        await Showtime.get_all(
-            session,
-            pagination=pagination,
-            where_clause=[Showtime.model.start_at >= datetime.now()],
+) -> Response:
+    async def producer():
+        return AppResponse.create_response(
+            await Showtime.get_all(
+                session,
+                pagination=pagination,
+                where_clause=[Showtime.model.start_at >= datetime.now()],
+            )
         )
+
+    return await ResponseCache.serve(
+        request, producer, tags=[Showtime.CACHE_TAG], query=pagination
     )
 
 
@@ -45,8 +54,8 @@ async def get_showtimes_latest(
 async def get_showtimes(
     session: AsyncSession = Depends(get_async_session),
     pagination: ShowtimeBase.Pagination = Query(...),
-) -> AppResponse[PaginatedResult[ShowtimeBase]]:
-    return AppResponse.create_response(
+) -> AppJSONResponse:
+    return AppResponse.create_json_response(
         await Showtime.get_all(
             session,
             pagination=pagination,
@@ -60,11 +69,22 @@ async def get_showtimes(
     response_model=AppResponse[ShowtimeDetails],
 )
 async def get_showtime(
+    request: Request,
     id: int,
     session: AsyncSession = Depends(get_async_session),
-) -> AppResponse[ShowtimeDetails]:
-    return AppResponse.create_response(
-        await Showtime.get_one_with_capacity(session, id)
+    redis_client: RedisClient = Depends(get_redis_client),
+) -> Response:
+    async def producer():
+        return AppResponse.create_response(
+            await Showtime.get_one_with_capacity(session, id, redis_client)
+        )
+
+    # seats available change with every reservation, so details are only cached briefly
+    return await ResponseCache.serve(
+        request,
+        producer,
+        tags=[Showtime.CACHE_TAG, Showtime.get_cache_tag(id)],
+        ttl=settings.RESPONSE_CACHE_SHOWTIME_TTL,
     )
 
 
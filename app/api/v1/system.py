@@ -0,0 +1,38 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.constants import UserRoles
+from app.core.auth.jwt import ValidateJwt
+from app.core.auth.password import PasswordHasher, get_password_hasher
+from app.core.auth.principal import UserPrincipalCache
+from app.core.auth.token_cache import VerifiedTokenCache
+from app.core.database import session_manager
+from app.core.response_cache import ResponseCache
+from app.core.schema import AppResponse
+from app.redis import RedisClient, get_redis_client
+
+
+system_router = APIRouter(prefix="/system", tags=["System"])
+
+
+@system_router.get(
+    "/metrics",
+    summary="Runtime metrics of in-process pools and caches",
+    dependencies=[Depends(ValidateJwt(UserRoles.ADMIN))],
+    response_model=AppResponse[dict[str, Any]],
+)
+async def get_system_metrics(
+    password_hasher: PasswordHasher = Depends(get_password_hasher),
+    redis_client: RedisClient = Depends(get_redis_client),
+) -> AppResponse[dict[str, Any]]:
+    return AppResponse.create_response(
+        {
+            "password_hasher": password_hasher.stats(),
+            "principal_cache": UserPrincipalCache.stats(),
+            "token_cache": VerifiedTokenCache.stats(),
+            "redis_pool": redis_client.stats(),
+            "database_pool": session_manager.stats(),
+            "response_cache": ResponseCache.stats(),
+        }
+    )
@@ -4,7 +4,7 @@ from app.constants import UserRoles
 from app.core.auth.jwt import ValidateJwt
 from app.core.database.session import get_async_session
 from app.core.pagination import PaginatedResult
-from app.core.schema import AppResponse
+from app.core.schema import AppJSONResponse, AppResponse
 from app.services.theatre import Theatre
 
 
@@ -20,7 +20,7 @@ theatre_router = APIRouter(prefix="/theatres", tags=["Theatre"])
 async def get_theatres(
     session: AsyncSession = Depends(get_async_session),
     pagination: Theatre.Pagination = Query(...),
-) -> AppResponse[PaginatedResult[Theatre]]:
-    return AppResponse.create_response(
+) -> AppJSONResponse:
+    return AppResponse.create_json_response(
         await Theatre.get_all(session, pagination=pagination)
     )
@@ -13,9 +13,17 @@ class CookieSigner:
     def dumps(self, obj: Any, salt: str | bytes | None = None) -> str:
         return self.signer.dumps(obj, salt)
 
-    def loads(self, signed_data: Any, max_age: int | None = None) -> Any:
+    def loads(
+        self,
+        signed_data: Any,
+        max_age: int | None = None,
+        return_timestamp: bool = False,
+    ) -> Any:
+        """Verify and load signed data, with 'return_timestamp' a tuple of the data and its signing datetime"""
         try:
-            data = self.signer.loads(signed_data, max_age=max_age)
+            data = self.signer.loads(
+                signed_data, max_age=max_age, return_timestamp=return_timestamp
+            )
             return data
         except SignatureExpired:
             raise HTTPException(status_code=401, detail="Cookie has expired")
@@ -6,9 +6,10 @@ from fastapi.security import APIKeyCookie
 import jwt
 
 from app.core.auth.schema import JwtPayload
+from app.core.auth.principal import UserPrincipalCache
+from app.core.auth.token_cache import VerifiedTokenCache
 from app.core.config import settings
 from app.core.auth.cookie import cookie_signer
-from app.core.database.session import get_async_session
 from app.constants import UserRoles
 from app.domain.user import UserBase
 
@@ -40,25 +41,35 @@ class JwtAuth:
             raise e
 
     @classmethod
-    async def validate_token(
-        cls, session: AsyncSession, token: AccessToken, role: UserRoles | None = None
+    def decode_token(cls, token: AccessToken) -> tuple[JwtPayload, float | None]:
+        """Verify a JWT token and return its payload, along with its 'exp' claim if any"""
+        if not token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Failed to decode token",
+            )
+
+        payload: dict = jwt.decode(
+            token, JwtAuth.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        expires_at = payload.get("exp")
+        payload: JwtPayload = JwtPayload.model_validate(payload, from_attributes=True)
+
+        return payload, expires_at
+
+    @classmethod
+    async def authorize(
+        cls,
+        payload: JwtPayload,
+        role: UserRoles | None = None,
+        session: AsyncSession | None = None,
     ) -> UserBase:
-        """Validate a JWT token and return payload"""
+        """Check the role of a verified payload and return its user, a database session is only used when the user is not cached"""
         unauth_exc = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Failed to decode token",
         )
         try:
-            if not token:
-                raise unauth_exc
-
-            payload: dict = jwt.decode(
-                token, JwtAuth.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
-            payload: JwtPayload = JwtPayload.model_validate(
-                payload, from_attributes=True
-            )
-
             if not payload.id:
                 raise unauth_exc
 
@@ -66,13 +77,32 @@ class JwtAuth:
                 unauth_exc.detail = "Validation failed, missing role"
                 raise unauth_exc
 
-            user_data = await UserBase.get_one(session, payload.id)
+            user_data = await UserPrincipalCache.get(payload.id, session)
 
             return user_data
         except Exception as e:
             logger.error(f"[JwtAuth]: validation failed: {e} {traceback.format_exc()}")
             raise unauth_exc
 
+    @classmethod
+    async def validate_token(
+        cls,
+        token: AccessToken,
+        role: UserRoles | None = None,
+        session: AsyncSession | None = None,
+    ) -> UserBase:
+        """Validate a JWT token and return its user"""
+        try:
+            payload, _ = cls.decode_token(token)
+        except Exception as e:
+            logger.error(f"[JwtAuth]: validation failed: {e} {traceback.format_exc()}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Failed to decode token",
+            )
+
+        return await cls.authorize(payload, role, session)
+
 
 cookie = APIKeyCookie(name=JwtAuth.COOKIE_KEY)
 
@@ -85,16 +115,44 @@ async def get_token_cookie(request: Request) -> AccessToken:
         raise HTTPException(status_code=401) from e
 
 
+async def get_token_payload(request: Request) -> JwtPayload:
+    """
+    Verified payload of the auth cookie.
+
+    Verified cookies are cached until the cookie or the JWT expires, so repeated requests of a session
+    skip the cookie signature check and the JWT decoding.
+    """
+    try:
+        signed_data = await cookie(request)
+
+        payload = VerifiedTokenCache.get(signed_data)
+        if payload is not None:
+            return payload
+
+        token, signed_at = cookie_signer.loads(
+            signed_data, JwtAuth.MAX_AGE, return_timestamp=True
+        )
+        payload, token_expires_at = JwtAuth.decode_token(token)
+
+        expires_at = signed_at.timestamp() + JwtAuth.MAX_AGE
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        VerifiedTokenCache.set(signed_data, payload, expires_at)
+        return payload
+    except Exception as e:
+        raise HTTPException(status_code=401) from e
+
+
 class ValidateJwt:
     def __init__(self, role: UserRoles | None = None):
         self.role = role
 
     async def __call__(
         self,
-        token: str = Depends(get_token_cookie),
-        session: AsyncSession = Depends(get_async_session),
+        payload: JwtPayload = Depends(get_token_payload),
     ):
         try:
-            return await JwtAuth.validate_token(session, token, self.role)
+            return await JwtAuth.authorize(payload, self.role)
         except Exception as e:
             raise HTTPException(status_code=401) from e
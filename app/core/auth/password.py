@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from pwdlib import PasswordHash
+
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsException
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class PasswordHasher:
+    """
+    Argon2 hashing and verification off the event loop.
+
+    Hashes run on a bounded thread pool, argon2 releases the GIL while hashing. Work is rejected with
+    TooManyRequestsException once 'max_pending' hashes are running or queued, so a login storm gets
+    429s instead of an ever growing queue.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self._password_hash = PasswordHash.recommended()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._dummy_hash: Optional[str] = None
+
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self._max_pending:
+            self.rejected += 1
+            raise TooManyRequestsException(
+                "Too many authentication attempts, try again later"
+            )
+
+        self.pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, fn, *args
+            )
+            self.completed += 1
+            return result
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._password_hash.hash, password)
+
+    async def verify(self, password: str, hashed_password: Optional[str]) -> bool:
+        """
+        Verify a password against its hash.
+
+        Without a hash (e.g. unknown email) a dummy hash is verified instead, so the response time does not tell
+        whether the user exists.
+        """
+        if hashed_password is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = await self.hash("dummy-password")
+            await self._run(self._password_hash.verify, password, self._dummy_hash)
+            return False
+
+        return await self._run(self._password_hash.verify, password, hashed_password)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self._max_workers,
+            "max_pending": self._max_pending,
+            "in_flight": self.pending,
+            "queued": max(self.pending - self._max_workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+def get_password_hasher() -> PasswordHasher:
+    return password_hasher
@@ -0,0 +1,135 @@
+import logging
+import time
+import traceback
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database.session import session_manager
+from app.domain.user import UserBase
+from app.redis import RedisClient, get_redis_client
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class UserPrincipalCache:
+    """
+    Cache of the users behind valid JWTs, so authenticated requests do not need a database session.
+
+    Lookups go through an in-process TTL LRU, then redis, then the database. Every entry records when it was
+    last read from the database, in strict mode entries older than PRINCIPAL_RECHECK_INTERVAL are re-read.
+
+    User changes must call 'invalidate', other processes drop their in-process entry after PRINCIPAL_CACHE_TTL.
+    """
+
+    _local: TTLCache[tuple[UserBase, float]] = TTLCache(
+        maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL
+    )
+
+    @classmethod
+    def get_cache_key(cls, user_id: int):
+        return f"users:{user_id}:principal"
+
+    @classmethod
+    def _is_fresh(cls, checked_at: float) -> bool:
+        if not settings.PRINCIPAL_STRICT_MODE:
+            return True
+        return time.time() - checked_at < settings.PRINCIPAL_RECHECK_INTERVAL
+
+    @classmethod
+    def _get_redis_client(cls) -> Optional[RedisClient]:
+        redis_client = get_redis_client()
+        try:
+            # raises when the client is not connected
+            redis_client.client
+            return redis_client
+        except RuntimeError:
+            return None
+
+    @classmethod
+    async def _get_from_redis(
+        cls, redis_client: RedisClient, user_id: int
+    ) -> Optional[tuple[UserBase, float]]:
+        try:
+            cached = await redis_client.get(cls.get_cache_key(user_id), as_json=True)
+            if not cached:
+                return None
+            return UserBase.model_validate(cached["user"]), cached["checked_at"]
+        except Exception as e:
+            logger.error(
+                f"[UserPrincipalCache]: Failed to read principal of user: {user_id}: {e} {traceback.format_exc()}"
+            )
+            return None
+
+    @classmethod
+    async def _load(cls, session: AsyncSession, user_id: int) -> UserBase:
+        return await UserBase.get_one(session, user_id)
+
+    @classmethod
+    async def get(
+        cls, user_id: int, session: Optional[AsyncSession] = None
+    ) -> UserBase:
+        """
+        Resolve a user by id, a database session is only opened on a cache miss.
+
+        Raises:
+            NotFoundException: if the user does not exist anymore
+        """
+        entry = cls._local.get(user_id)
+        if entry and cls._is_fresh(entry[1]):
+            return entry[0]
+
+        redis_client = cls._get_redis_client()
+        if redis_client:
+            entry = await cls._get_from_redis(redis_client, user_id)
+            if entry and cls._is_fresh(entry[1]):
+                cls._local.set(user_id, entry)
+                return entry[0]
+
+        if session is None:
+            async with session_manager.session() as new_session:
+                user = await cls._load(new_session, user_id)
+        else:
+            user = await cls._load(session, user_id)
+
+        await cls.set(user, redis_client)
+        return user
+
+    @classmethod
+    async def set(
+        cls, user: UserBase, redis_client: Optional[RedisClient] = None
+    ) -> None:
+        checked_at = time.time()
+        cls._local.set(user.id, (user, checked_at))
+
+        if redis_client is None:
+            return
+
+        await redis_client.set(
+            cls.get_cache_key(user.id),
+            {"user": user.model_dump(), "checked_at": checked_at},
+            ex=settings.PRINCIPAL_REDIS_TTL,
+        )
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return cls._local.stats()
+
+    @classmethod
+    async def invalidate(cls, user_id: int) -> None:
+        """Forget a user after its row changed, must be called after the change is committed"""
+        cls._local.delete(user_id)
+
+        redis_client = cls._get_redis_client()
+        if redis_client is None:
+            return
+
+        try:
+            await redis_client.delete(cls.get_cache_key(user_id))
+        except Exception as e:
+            logger.error(
+                f"[UserPrincipalCache]: Failed to invalidate principal of user: {user_id}: {e} {traceback.format_exc()}"
+            )
@@ -0,0 +1,35 @@
+import time
+from typing import Optional
+
+from app.core.auth.schema import JwtPayload
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class VerifiedTokenCache:
+    """
+    Payloads of already verified auth cookies, keyed by the raw signed cookie value.
+
+    An entry lives until the cookie or the JWT expires, whichever comes first, so a cached cookie is
+    never accepted past the point where verifying it again would fail.
+    """
+
+    _tokens: TTLCache[JwtPayload] = TTLCache(
+        maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+
+    @classmethod
+    def get(cls, signed_cookie: str) -> Optional[JwtPayload]:
+        return cls._tokens.get(signed_cookie)
+
+    @classmethod
+    def set(cls, signed_cookie: str, payload: JwtPayload, expires_at: float) -> None:
+        """Cache a verified payload until 'expires_at', a unix timestamp"""
+        ttl = expires_at - time.time()
+        if ttl <= 0:
+            return
+        cls._tokens.set(signed_cookie, payload, ttl=ttl)
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return cls._tokens.stats()
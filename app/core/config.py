@@ -15,20 +15,95 @@ class TransitionReservationToCompleteJobSettings(BaseSettings):
 
     TRANSFORM_TO_COMPLETE_INTERVAL: int = 60 * 5  # run job every 5 minutes
     OFFSET_DELAY_MINUTES: int = 5  # run job after 5 minutes of show ending
+    COMPLETE_BATCH_SIZE: int = 100  # showtimes completed per transaction
 
 
 class CheckReservationConfirmedJobSettings(BaseSettings):
     """
-    Settings for the job 'check_if_confirmed' which will check if a reservation is confirmed after offset delay
-    if the user have confirmed their reservation by payment within this offset time, then it will be CONFIRMED
+    A seat hold lives for 'HELD_STATUS_TIMER' seconds, if the user have confirmed their reservation by payment
+    within this time, then it will be CONFIRMED. Otherwise the job 'sweep_expired_holds' deletes the HELD reservation.
     """
 
     HELD_STATUS_TIMER: int = 60
+    HOLD_SWEEP_INTERVAL: int = 10  # run job every 10 seconds
+    HOLD_SWEEP_BATCH_SIZE: int = 500
+
+
+class AttendanceSettings(BaseSettings):
+    """
+    Scanned tickets are copied into the 'attendance_scans' staging table 'ATTENDANCE_COPY_BATCH_SIZE' rows at a time.
+    A showtime with scans completes its attended reservations and marks the others as NO_SHOW, see 'Reservation.complete_showtimes'.
+    """
+
+    ATTENDANCE_COPY_BATCH_SIZE: int = 5000
+
+
+class ReportingSettings(BaseSettings):
+    """
+    Revenue is reported per showtime date, the date of the showtime start in 'REPORTING_TIMEZONE'.
+    The job 'rebuild_revenue_rollups' recomputes the rollups from the paid reservations.
+    """
+
+    REPORTING_TIMEZONE: str = "UTC"
+    REBUILD_REVENUE_ROLLUPS_INTERVAL: int = 60 * 60  # run job every hour
+
+
+class ExportSettings(BaseSettings):
+    """
+    Exports are read through a server side cursor, 'EXPORT_FETCH_SIZE' rows at a time, and flushed to the client
+    after every batch, so memory stays constant whatever the size of the export.
+    """
+
+    EXPORT_FETCH_SIZE: int = 1000
+
+
+class JobRuntimeSettings(BaseSettings):
+    """
+    Every celery worker process runs its async tasks on one event loop with its own database pool of
+    'JOB_DB_POOL_SIZE' + 'JOB_DB_MAX_OVERFLOW' connections, closed within 'JOB_SHUTDOWN_TIMEOUT' seconds on shutdown.
+    """
+
+    JOB_DB_POOL_SIZE: int = 5
+    JOB_DB_MAX_OVERFLOW: int = 0
+    JOB_SHUTDOWN_TIMEOUT: float = 10
+
+
+class SeatMapSettings(BaseSettings):
+    """
+    Settings for the per-showtime seat occupancy bitmap kept in redis, the map is rebuilt from the database once expired
+    """
+
+    SEAT_MAP_TTL: int = 60 * 60 * 6
+    SEAT_MAP_BUILD_TTL: int = 30  # seconds a rebuild may take before its result is dropped
+    SEAT_MAP_THEATRE_CACHE_SIZE: int = 10_000  # showtime theatres kept in process
+    SEAT_MAP_THEATRE_CACHE_TTL: int = 60
+
+
+class ShowtimeCounterSettings(BaseSettings):
+    """
+    Settings for the per-showtime HELD and CONFIRMED counters kept in redis, the job 'reconcile_showtime_counters'
+    recounts the counters of upcoming showtimes from the database.
+    """
+
+    SHOWTIME_COUNTER_TTL: int = 60 * 60 * 6
+    RECONCILE_COUNTERS_INTERVAL: int = 60 * 5  # run job every 5 minutes
 
 
 class RedisSettings(BaseSettings):
+    """
+    The redis pool holds up to 'REDIS_MAX_CONNECTIONS' connections, once they are all in use callers wait up to
+    'REDIS_POOL_TIMEOUT' seconds for one. Commands failing on connection errors are retried 'REDIS_RETRY_ATTEMPTS'
+    times with an exponential backoff of at most 'REDIS_RETRY_BACKOFF_CAP' seconds.
+    """
+
     REDIS_SERVER: str
     CELERY_RESULT_BACKEND: str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 2
+    REDIS_SOCKET_TIMEOUT: float = 5
+    REDIS_CONNECT_TIMEOUT: float = 2
+    REDIS_RETRY_ATTEMPTS: int = 3
+    REDIS_RETRY_BACKOFF_CAP: float = 1
 
 
 class RabbitmqSettings(BaseSettings):
@@ -44,11 +119,31 @@ class NotificationSettings(BaseSettings):
 
 
 class PostgresSettings(BaseSettings):
+    """
+    Every process keeps up to 'DB_POOL_SIZE' + 'DB_MAX_OVERFLOW' connections, size them so that all workers together
+    stay below the server 'max_connections'. Once they are all checked out callers wait up to 'DB_POOL_TIMEOUT' seconds.
+
+    asyncpg caches prepared statements per connection, which breaks behind PgBouncer in transaction pooling mode.
+    'DB_PGBOUNCER' disables both statement caches and names every prepared statement uniquely.
+
+    With 'DB_TRUSTED_READS' rows read through the domain models are mapped without validation by default,
+    see 'TrustedMapper', reads can still opt in or out per call.
+    """
+
     PG_USER: str
     PG_PW: str
     PG_SERVER: str
     PG_PORT: str
     PG_DB: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 10
+    DB_POOL_RECYCLE: int = 60 * 30  # seconds, -1 keeps connections forever
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg statement cache per connection
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # sqlalchemy prepared statement cache per connection
+    DB_PGBOUNCER: bool = False
+    DB_TRUSTED_READS: bool = False
 
 
 class JwtSettings(BaseSettings):
@@ -57,6 +152,50 @@ class JwtSettings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
 
+class PrincipalCacheSettings(BaseSettings):
+    """
+    Users behind valid JWTs are cached in process for 'PRINCIPAL_CACHE_TTL' seconds and in redis for 'PRINCIPAL_REDIS_TTL'
+    seconds. With 'PRINCIPAL_STRICT_MODE' a cached user is re-read from the database every 'PRINCIPAL_RECHECK_INTERVAL' seconds.
+    """
+
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL: int = 30
+    PRINCIPAL_REDIS_TTL: int = 60 * 10
+    PRINCIPAL_STRICT_MODE: bool = False
+    PRINCIPAL_RECHECK_INTERVAL: int = 60
+
+
+class TokenCacheSettings(BaseSettings):
+    """
+    Number of verified auth cookies kept in process, a cached cookie skips the signature and JWT verification until it expires.
+    """
+
+    TOKEN_CACHE_SIZE: int = 10_000
+
+
+class PasswordHasherSettings(BaseSettings):
+    """
+    Password hashing runs on a pool of 'PASSWORD_HASH_WORKERS' threads, once 'PASSWORD_HASH_MAX_PENDING' hashes are
+    running or queued new sign ins and sign ups are rejected with 429.
+    """
+
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+
+class ResponseCacheSettings(BaseSettings):
+    """
+    Public catalog responses are cached in redis for 'RESPONSE_CACHE_TTL' seconds, showtime details include the
+    seats available so they are only cached for 'RESPONSE_CACHE_SHOWTIME_TTL' seconds. Every process also keeps up to
+    'RESPONSE_CACHE_LOCAL_SIZE' responses in memory for 'RESPONSE_CACHE_LOCAL_TTL' seconds.
+    """
+
+    RESPONSE_CACHE_TTL: int = 60 * 5
+    RESPONSE_CACHE_SHOWTIME_TTL: int = 5
+    RESPONSE_CACHE_LOCAL_TTL: int = 5
+    RESPONSE_CACHE_LOCAL_SIZE: int = 1000
+
+
 class CookieSettings(BaseSettings):
     SECRET_COOKIE_KEY: str = (
         "a356258a081495d33581a3aeb850666083cf6009ae29021e7201f9199e6db750"
@@ -71,8 +210,18 @@ class Settings(
     NotificationSettings,
     JwtSettings,
     CookieSettings,
+    PrincipalCacheSettings,
+    PasswordHasherSettings,
+    TokenCacheSettings,
+    ResponseCacheSettings,
     CheckReservationConfirmedJobSettings,
     TransitionReservationToCompleteJobSettings,
+    JobRuntimeSettings,
+    AttendanceSettings,
+    ReportingSettings,
+    ExportSettings,
+    SeatMapSettings,
+    ShowtimeCounterSettings,
 ):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -1,12 +1,14 @@
-from typing import Callable, Any, Literal, Optional, override, Dict, Union
+import asyncio
+import json
+from typing import Callable, Any, Literal, Mapping, Optional, override, Dict, Union
 from sqlalchemy import (
     Select,
     delete,
     insert,
     select,
     func,
+    text,
     DateTime,
-    Column,
     update,
 )
 from sqlalchemy.sql.roles import ColumnsClauseRole, TypedColumnsClauseRole
@@ -19,7 +21,6 @@ from sqlalchemy.orm.attributes import InstrumentedAttribute
 from pydantic import BaseModel
 from sqlalchemy.exc import IntegrityError
 from asyncpg.exceptions import ForeignKeyViolationError, UniqueViolationError
-from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import RelationshipProperty
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm.strategy_options import _AbstractLoad
@@ -36,6 +37,11 @@ from sqlalchemy.orm.decl_api import (
 from datetime import datetime
 
 from app.core.pagination import PaginatedResult
+from app.core.pagination.base_query import CountMode
+from app.core.pagination.cursor import PaginationCursor
+
+from .explain import Explain
+from .registry import ModelMetadata, ModelRegistry, listen_mapper_configured
 
 
 class DeclarativeBaseNoMeta(_DeclarativeBaseNoMeta):
@@ -94,6 +100,67 @@ class Base(DeclarativeBaseNoMeta, metaclass=DeclarativeAttributeIntercept):
     async def count(cls, session: AsyncSession, /) -> int:
         return await session.scalar(func.count(cls.id))
 
+    @classmethod
+    async def count_where(
+        cls,
+        session: AsyncSession,
+        where_clause: list[ColumnElement[bool]] | None = None,
+        /,
+        *,
+        mode: CountMode = CountMode.EXACT,
+    ) -> int | None:
+        """
+        Count the records matching the where clause.
+
+        With 'estimate' mode the planner statistics are used instead of scanning: 'pg_class.reltuples'
+        of the table when not filtered, otherwise the row estimate of the EXPLAIN plan.
+        """
+        where_base = where_clause or []
+
+        if mode == CountMode.NONE:
+            return None
+
+        if mode == CountMode.ESTIMATE:
+            if not where_base:
+                reltuples = await session.scalar(
+                    text(
+                        "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)"
+                    ),
+                    {"table_name": cls.__tablename__},
+                )
+                # -1 when the table was never analyzed
+                if reltuples is not None and reltuples >= 0:
+                    return reltuples
+            else:
+                plan = await session.scalar(
+                    Explain(select(cls.id).where(*where_base))
+                )
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+
+        return await session.scalar(select(func.count(cls.id)).where(*where_base))
+
+    @classmethod
+    def has_idle_connection(cls, session: AsyncSession) -> bool:
+        """Whether the pool of the session can hand out a connection without waiting"""
+        pool = getattr(session.bind, "pool", None)
+        checkedin = getattr(pool, "checkedin", None)
+        return checkedin is not None and checkedin() > 0
+
+    @classmethod
+    async def count_where_concurrently(
+        cls,
+        session: AsyncSession,
+        where_clause: list[ColumnElement[bool]] | None = None,
+        /,
+    ) -> int:
+        """Exact count on a connection of its own, so it can run while the session runs another query"""
+        async with AsyncSession(bind=session.bind) as count_session:
+            return await cls.count_where(
+                count_session, where_clause, mode=CountMode.EXACT
+            )
+
     @classmethod
     def get_select_in_load(cls) -> list[Load]:
         return []
@@ -103,26 +170,20 @@ class Base(DeclarativeBaseNoMeta, metaclass=DeclarativeAttributeIntercept):
         return cls.get_select_in_load()
 
     @classmethod
-    def get_relationships(cls) -> Dict[str, RelationshipProperty[Any]]:
-        mapper = inspect(cls)
-        relations = {rel[0]: rel[1] for rel in mapper.relationships.items()}
-        return relations
+    def get_model_metadata(cls) -> ModelMetadata:
+        return ModelRegistry.get(cls)
 
     @classmethod
-    def get_foreign_columns(cls) -> Dict[str, Column]:
-        relations = cls.get_relationships()
-        foreign_cols = {}
-        for rel in relations:
-            relationship_property: RelationshipProperty = relations[rel]
-            for fk in relationship_property.remote_side:
-                fk: Column = fk
-                foreign_cols[rel] = fk.name
+    def get_relationships(cls) -> Mapping[str, RelationshipProperty[Any]]:
+        return cls.get_model_metadata().relationships
 
-        return foreign_cols
+    @classmethod
+    def get_foreign_columns(cls) -> Mapping[str, str]:
+        return cls.get_model_metadata().foreign_columns
 
     @classmethod
-    def columns(cls):
-        return {_column.name for _column in inspect(cls).c}
+    def columns(cls) -> frozenset[str]:
+        return cls.get_model_metadata().columns
 
     @classmethod
     async def exists(
@@ -205,14 +266,16 @@ class Base(DeclarativeBaseNoMeta, metaclass=DeclarativeAttributeIntercept):
             if isinstance(data[0], BaseModel):
                 payload = [
                     item.model_dump(
-                        exclude_unset=True, exclude_none=True, by_alias=True
+                        exclude_unset=True, exclude_none=True, by_alias=False
                     )
                     for item in data
                 ]
             statement = insert(cls).returning(cls)
+            result = await session.scalars(statement, payload)
+            result = result.all()
             if commit:
                 await session.commit()
-            return await session.scalars(statement, payload)
+            return result
         except IntegrityError as e:
             await session.rollback()
             raise e
@@ -228,37 +291,95 @@ class Base(DeclarativeBaseNoMeta, metaclass=DeclarativeAttributeIntercept):
         where_clause: list[ColumnElement[bool]] | None = None,
         order_clause: list[InstrumentedAttribute] | None = None,
         options: list[_AbstractLoad] | None = None,
+        cursor: str | None = None,
+        count: CountMode = CountMode.EXACT,
+        columns: list[InstrumentedAttribute] | None = None,
     ):
+        """
+        Get a page of records, by OFFSET or by seeking past a cursor when one is passed.
+
+        The order is always completed with the id, and every page that has a next page
+        returns a 'next_cursor' so clients can switch to keyset pagination at any page.
+
+        'total_records' is computed according to the count mode, an exact count runs
+        concurrently with the page query.
+
+        With 'columns' only those columns are selected and the page holds rows instead of
+        entities, loader options do not apply to rows and are ignored.
+        """
         try:
-            statement = select(cls)
             where_base = []
 
             if where_clause:
                 where_base.extend(where_clause)
 
-            statement = statement.where(*where_base)
-
-            if order_clause:
-                statement = statement.order_by(*order_clause)
+            sort_keys = PaginationCursor.get_sort_keys(order_clause or [], cls.id)
+
+            if columns:
+                # the cursor is built from the sort keys of the last row
+                selected = {column.key for column in columns}
+                statement = select(
+                    *columns,
+                    *[
+                        sort_key.column
+                        for sort_key in sort_keys
+                        if sort_key.name not in selected
+                    ],
+                )
+            else:
+                statement = select(cls)
 
-            total_count = await session.scalar(
-                select(func.count()).select_from(
-                    select(cls).where(*where_base).subquery()
+            if cursor:
+                cursor_values = PaginationCursor.decode(cursor, sort_keys)
+                statement = statement.where(
+                    *where_base, PaginationCursor.seek_clause(sort_keys, cursor_values)
                 )
+            else:
+                statement = statement.where(*where_base)
+
+            statement = statement.order_by(
+                *[sort_key.order_expression() for sort_key in sort_keys]
             )
-            base_options = cls.get_select_in_load()
-            if base_options:
-                statement = statement.options(*base_options)
 
-            if options:
-                statement = statement.options(*options)
+            if not columns:
+                base_options = cls.get_select_in_load()
+                if base_options:
+                    statement = statement.options(*base_options)
 
-            statement = statement.offset((page - 1) * size).limit(size)
+                if options:
+                    statement = statement.options(*options)
 
-            result = await session.scalars(statement)
+            if not cursor:
+                statement = statement.offset((page - 1) * size)
+
+            # one extra row tells whether there is a next page
+            statement = statement.limit(size + 1)
+
+            execute = session.execute if columns else session.scalars
+
+            # a second connection per page exhausts the pool under load, only take an idle one
+            if count == CountMode.EXACT and cls.has_idle_connection(session):
+                total_count, result = await asyncio.gather(
+                    cls.count_where_concurrently(session, where_base),
+                    execute(statement),
+                )
+            else:
+                total_count = await cls.count_where(session, where_base, mode=count)
+                result = await execute(statement)
+
+            result = result.all()
+
+            next_cursor = None
+            if len(result) > size:
+                result = result[:size]
+                next_cursor = PaginationCursor.encode(sort_keys, result[-1])
 
             return PaginatedResult(
-                result=result, size=size, page=page, total_records=total_count
+                result=result,
+                size=size,
+                page=page,
+                total_records=total_count,
+                next_cursor=next_cursor,
             )
         except Exception as e:
             raise e
@@ -273,9 +394,11 @@ class Base(DeclarativeBaseNoMeta, metaclass=DeclarativeAttributeIntercept):
         order_clause: list[InstrumentedAttribute] = [],
         limit: int = 20,
         options: list[_AbstractLoad] | None = None,
+        columns: list[InstrumentedAttribute] | None = None,
     ):
+        """With 'columns' only those columns are selected and rows are returned instead of entities"""
         try:
-            statement = select(cls)
+            statement = select(*columns) if columns else select(cls)
             where_base = []
 
             if where_clause:
@@ -286,17 +409,21 @@ class Base(DeclarativeBaseNoMeta, metaclass=DeclarativeAttributeIntercept):
             if order_clause:
                 statement = statement.order_by(*order_clause)
 
-            base_options = cls.get_options()
+            if not columns:
+                base_options = cls.get_options()
 
-            if base_options:
-                statement = statement.options(*base_options)
+                if base_options:
+                    statement = statement.options(*base_options)
 
-            if options:
-                statement = statement.options(*options)
+                if options:
+                    statement = statement.options(*options)
 
             statement = statement.limit(limit)
 
-            result = await session.scalars(statement)
+            if columns:
+                result = await session.execute(statement)
+            else:
+                result = await session.scalars(statement)
 
             return result.all()
         except Exception as e:
@@ -344,6 +471,7 @@ class Base(DeclarativeBaseNoMeta, metaclass=DeclarativeAttributeIntercept):
         *,
         where_clause: list[ColumnElement[bool]] | None = None,
         commit: bool = True,
+        options: list[_AbstractLoad] | None = None,
     ):
         if not where_clause:
             raise ValueError("must pass where_clause")
@@ -353,9 +481,12 @@ class Base(DeclarativeBaseNoMeta, metaclass=DeclarativeAttributeIntercept):
                 exclude_unset=True, exclude_none=True, by_alias=False
             )
 
-        updated_model = await session.scalar(
-            update(cls).values(data).filter(*where_clause).returning(cls)
-        )
+        statement = update(cls).values(data).filter(*where_clause).returning(cls)
+
+        if options:
+            statement = statement.options(*options)
+
+        updated_model = await session.scalar(statement)
 
         if commit:
             await session.commit()
@@ -657,3 +788,6 @@ class Base(DeclarativeBaseNoMeta, metaclass=DeclarativeAttributeIntercept):
                 raise ValueError("Foreig Key Constraint is violated")
 
             raise e
+
+
+listen_mapper_configured(Base)
@@ -12,7 +12,9 @@ from fastapi import HTTPException
 from .utils import CreateModelRelations
 from sqlalchemy.orm.strategy_options import _AbstractLoad
 
+from app.core.config import settings
 from app.core.exceptions import NotFoundException
+from .trusted import TrustedMapper
 
 
 class BaseModelDatabaseMixin(AppBaseModel, ABC):
@@ -22,6 +24,26 @@ class BaseModelDatabaseMixin(AppBaseModel, ABC):
     def relations(cls):
         return []
 
+    @classmethod
+    def get_projection(cls) -> list[InstrumentedAttribute]:
+        """Columns of the model that back a field of this domain model, relationship fields are left out"""
+        columns = cls.model.columns()
+        return [getattr(cls.model, name) for name in cls.model_fields if name in columns]
+
+    @classmethod
+    def from_row(cls, row: Any, /, *, trusted: bool | None = None) -> Self:
+        """
+        Build the domain model of a row read from the database.
+
+        Args:
+            trusted: Skip validation and map the row with 'TrustedMapper', defaults to DB_TRUSTED_READS
+        """
+        if trusted is None:
+            trusted = settings.DB_TRUSTED_READS
+        if trusted:
+            return TrustedMapper.map(cls, row)
+        return cls.model_validate(row, from_attributes=True)
+
     @classmethod
     async def exists(
         cls,
@@ -99,10 +121,7 @@ class BaseModelDatabaseMixin(AppBaseModel, ABC):
             if return_as_base:
                 return result
 
-            return [
-                cls.model_validate(**item.dict(), from_attributes=True)
-                for item in result
-            ]
+            return [cls.model_validate(item, from_attributes=True) for item in result]
         except Exception as e:
             raise e
 
@@ -116,10 +135,14 @@ class BaseModelDatabaseMixin(AppBaseModel, ABC):
         where_clause: list[ColumnElement[bool]] | None = None,
         commit: bool = True,
         return_as_base: bool = False,
+        options: list[_AbstractLoad] | None = None,
     ):
         try:
+            if not options:
+                options = cls.relations()
+
             result = await cls.model.update_one(
-                session, data, where_clause=where_clause, commit=commit
+                session, data, where_clause=where_clause, commit=commit, options=options
             )
 
             if return_as_base:
@@ -141,11 +164,19 @@ class BaseModelDatabaseMixin(AppBaseModel, ABC):
         limit: int = 20,
         options: list[_AbstractLoad] | None = None,
         return_as_base: bool = False,
+        trusted: bool | None = None,
+        projected: bool = False,
     ):
+        """
+        With 'projected' only the columns of this model's fields are selected, see 'get_projection',
+        relations are not loaded and 'return_as_base' returns rows instead of entities.
+        """
         try:
             if not options:
                 options = cls.relations()
 
+            columns = cls.get_projection() if projected else None
+
             if not pagination:
                 result = await cls.model.get_all(
                     session,
@@ -153,14 +184,13 @@ class BaseModelDatabaseMixin(AppBaseModel, ABC):
                     order_clause=order_clause,
                     options=options,
                     limit=limit,
+                    columns=columns,
                 )
 
                 if return_as_base:
                     return result
 
-                return [
-                    cls.model_validate(item, from_attributes=True) for item in result
-                ]
+                return [cls.from_row(item, trusted=trusted) for item in result]
 
             pagination_where_clause = pagination.filter_fields
             pagination_order_clause = pagination.sort_fields
@@ -174,13 +204,16 @@ class BaseModelDatabaseMixin(AppBaseModel, ABC):
                 where_clause=where_clause + pagination_where_clause,
                 order_clause=order_clause + pagination_order_clause,
                 options=options,
+                cursor=pagination.cursor,
+                count=pagination.count,
+                columns=columns,
             )
             if return_as_base:
                 return paginated_result
 
             result = paginated_result.result
             paginated_result.result = [
-                cls.model_validate(item, from_attributes=True) for item in result
+                cls.from_row(item, trusted=trusted) for item in result
             ]
 
             return paginated_result
@@ -200,6 +233,7 @@ class BaseModelDatabaseMixin(AppBaseModel, ABC):
         options: list[_AbstractLoad] | None = None,
         return_as_base: bool = False,
         raise_not_found: bool = True,
+        trusted: bool | None = None,
     ) -> Self:
         current_options = []
         current_options.extend(cls.relations())
@@ -221,7 +255,7 @@ class BaseModelDatabaseMixin(AppBaseModel, ABC):
 
         if return_as_base:
             return result
-        return cls.model_validate(result, from_attributes=True)
+        return cls.from_row(result, trusted=trusted)
 
     @classmethod
     async def upsert_one(
@@ -0,0 +1,60 @@
+import time
+from typing import Any
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool of the async engine that records how long checkouts wait for a connection and how often they time out.
+
+    Once 'pool_size' + 'max_overflow' connections are checked out, callers wait up to 'pool_timeout' seconds.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.acquired = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started_at = time.monotonic()
+        try:
+            connection = super()._do_get()
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+
+        waited = time.monotonic() - started_at
+        self.acquired += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # the engine recreates its pool on dispose, keep the stats of this process across it
+        pool = super().recreate()
+        pool.acquired = self.acquired
+        pool.timeouts = self.timeouts
+        pool.total_wait_seconds = self.total_wait_seconds
+        pool.max_wait_seconds = self.max_wait_seconds
+        return pool
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(
+                self.total_wait_seconds / self.acquired * 1000, 3
+            )
+            if self.acquired
+            else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
@@ -0,0 +1,133 @@
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Mapping
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, event
+from sqlalchemy.orm import Mapper, RelationshipProperty, configure_mappers
+from sqlalchemy.types import TypeEngine
+
+import logging
+
+logger = logging.getLogger("uvicorn.info")
+logger.setLevel(logging.INFO)
+
+if TYPE_CHECKING:
+    from .base import Base
+
+
+class ModelRegistryError(Exception):
+    pass
+
+
+def get_converter(column_type: TypeEngine) -> Callable[[str], Any]:
+    """Converter of a query string value to the python value of a column type"""
+    if isinstance(column_type, Boolean):
+        return lambda value: value == "true" or value == "1"
+    if isinstance(column_type, Integer):
+        return int
+    if isinstance(column_type, Float):
+        return float
+    if isinstance(column_type, DateTime):
+        return datetime.fromisoformat
+    if isinstance(column_type, Date):
+        return date.fromisoformat
+    return lambda value: value
+
+
+class ModelMetadata:
+    """Frozen mapper metadata of a model, computed once when its mapper is configured"""
+
+    def __init__(self, mapper: Mapper):
+        self.model = mapper.class_
+        self.columns: frozenset[str] = frozenset(
+            column.name for column in mapper.columns
+        )
+        self.column_types: Mapping[str, TypeEngine] = MappingProxyType(
+            {column.name: column.type for column in mapper.columns}
+        )
+        self.converters: Mapping[str, Callable[[str], Any]] = MappingProxyType(
+            {name: get_converter(type_) for name, type_ in self.column_types.items()}
+        )
+        self.relationships: Mapping[str, RelationshipProperty[Any]] = (
+            MappingProxyType(dict(mapper.relationships.items()))
+        )
+
+        foreign_columns = {}
+        for name, relationship_property in self.relationships.items():
+            for fk in relationship_property.remote_side:
+                foreign_columns[name] = fk.name
+        self.foreign_columns: Mapping[str, str] = MappingProxyType(foreign_columns)
+
+
+class ModelRegistry:
+    """
+    Registry of the metadata of every mapped model.
+
+    Entries are added by the 'mapper_configured' event, reading a model that was not configured
+    yet configures all pending mappers first.
+    """
+
+    _models: ClassVar[dict[type, ModelMetadata]] = {}
+
+    @classmethod
+    def register(cls, mapper: Mapper) -> ModelMetadata:
+        metadata = ModelMetadata(mapper)
+        cls._models[mapper.class_] = metadata
+        return metadata
+
+    @classmethod
+    def get(cls, model: type["Base"]) -> ModelMetadata:
+        metadata = cls._models.get(model)
+        if metadata is None:
+            configure_mappers()
+            metadata = cls._models.get(model)
+
+        if metadata is None:
+            raise ModelRegistryError(f"Model '{model.__name__}' is not mapped")
+
+        return metadata
+
+    @classmethod
+    def validate(cls) -> None:
+        """
+        Configure all mappers and fail fast if the models are inconsistent, meant to run at startup.
+
+        Raises:
+            ModelRegistryError: if a mapper cannot be configured or a model is not usable by the database layer
+        """
+        try:
+            configure_mappers()
+        except Exception as e:
+            raise ModelRegistryError(f"Failed to configure mappers: {e}") from e
+
+        errors = []
+        for model, metadata in cls._models.items():
+            if "id" not in metadata.columns:
+                errors.append(f"'{model.__name__}' has no 'id' column")
+
+            for name, relationship_property in metadata.relationships.items():
+                target = relationship_property.mapper.class_
+                if target not in cls._models:
+                    errors.append(
+                        f"'{model.__name__}.{name}' targets '{target.__name__}' which is not registered"
+                    )
+
+            for column in model.__table__.columns:
+                for fk in column.foreign_keys:
+                    if fk.column.table not in {
+                        other.model.__table__ for other in cls._models.values()
+                    }:
+                        errors.append(
+                            f"'{model.__name__}.{column.name}' references unmapped table '{fk.column.table.name}'"
+                        )
+
+        if errors:
+            raise ModelRegistryError("Inconsistent models: " + "; ".join(errors))
+
+        logger.info(f"[ModelRegistry]: validated {len(cls._models)} models")
+
+
+def listen_mapper_configured(base: type["Base"]) -> None:
+    @event.listens_for(base, "mapper_configured", propagate=True)
+    def _on_mapper_configured(mapper: Mapper, class_: type) -> None:
+        ModelRegistry.register(mapper)
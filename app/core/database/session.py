@@ -1,4 +1,5 @@
 from typing import Any, AsyncIterator
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
@@ -7,6 +8,8 @@ from sqlalchemy.ext.asyncio import (
 )
 from contextlib import asynccontextmanager
 from sqlalchemy import URL
+from app.core.config import Settings, settings
+from .pool import InstrumentedQueuePool
 from .url import DATABASE_URL
 
 
@@ -26,6 +29,15 @@ class SessionManager:
             )
         )
 
+    def stats(self) -> dict[str, Any]:
+        if self.engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        pool = self.engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            return pool.stats()
+        return {"status": pool.status()}
+
     async def close(self) -> None:
         if self.engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
@@ -50,11 +62,34 @@ class SessionManager:
             await session.close()
 
 
+def get_engine_kwargs(settings: Settings) -> dict[str, Any]:
+    connect_args: dict[str, Any] = {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_PGBOUNCER:
+        # a transaction may run on any server connection, so statements must not outlive it or clash by name
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return {
+        "echo": False,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
 session_manager: SessionManager = SessionManager(
     DATABASE_URL,
-    kwargs={
-        "echo": False,
-    },
+    kwargs=get_engine_kwargs(settings),
 )
 
 
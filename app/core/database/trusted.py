@@ -0,0 +1,104 @@
+import enum
+import types
+from typing import Any, Callable, ClassVar, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+_MISSING = object()
+
+type Converter = Callable[[Any], Any]
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    """'Optional[X]' and 'X | None' to 'X', other unions are returned as is"""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+class TrustedMapper:
+    """
+    Builds domain models from rows read from our own database without validating them.
+
+    A mapper is generated once per model class, it reads every field as an attribute of the row, so it accepts ORM
+    entities and 'Row' objects alike. Nested models and lists of nested models are mapped recursively, enum fields
+    are coerced from their value, everything else is assigned as is. Optional fields missing on the row keep their
+    default, a missing required field raises a 'ValueError'.
+
+    Instances are assembled directly instead of through 'model_construct', which costs about as much as validating
+    from attributes in pydantic-core. Only use it on models without validators, the values are trusted to already
+    match the field types.
+    """
+
+    _mappers: ClassVar[dict[type[BaseModel], Callable[[Any], BaseModel]]] = {}
+
+    @classmethod
+    def get(cls, model: type[BaseModel]) -> Callable[[Any], BaseModel]:
+        mapper = cls._mappers.get(model)
+        if mapper is None:
+            mapper = cls._build(model)
+            cls._mappers[model] = mapper
+        return mapper
+
+    @classmethod
+    def map(cls, model: type[BaseModel], row: Any) -> BaseModel:
+        return cls.get(model)(row)
+
+    @classmethod
+    def _get_converter(cls, annotation: Any) -> Converter | None:
+        annotation = _unwrap_optional(annotation)
+
+        if get_origin(annotation) is list:
+            (item_annotation,) = get_args(annotation) or (Any,)
+            item_converter = cls._get_converter(item_annotation)
+            if item_converter is None:
+                return None
+            return lambda value: [item_converter(item) for item in value]
+
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return lambda value: (
+                value if isinstance(value, annotation) else cls.map(annotation, value)
+            )
+
+        if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+            return lambda value: (
+                value if isinstance(value, annotation) else annotation(value)
+            )
+
+        return None
+
+    @classmethod
+    def _build(cls, model: type[BaseModel]) -> Callable[[Any], BaseModel]:
+        fields = [
+            (name, cls._get_converter(field.annotation), field, field.is_required())
+            for name, field in model.model_fields.items()
+        ]
+
+        def mapper(row: Any) -> BaseModel:
+            # same state 'model_construct' sets, without its per call bookkeeping
+            values = {}
+            fields_set = set()
+            for name, converter, field, is_required in fields:
+                value = getattr(row, name, _MISSING)
+                if value is _MISSING:
+                    if is_required:
+                        raise ValueError(
+                            f"Row has no value for required field '{name}' of {model.__name__}"
+                        )
+                    values[name] = field.get_default(call_default_factory=True)
+                    continue
+                if converter is not None and value is not None:
+                    value = converter(value)
+                values[name] = value
+                fields_set.add(name)
+
+            instance = model.__new__(model)
+            object.__setattr__(instance, "__dict__", values)
+            object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+            object.__setattr__(instance, "__pydantic_extra__", None)
+            object.__setattr__(instance, "__pydantic_private__", None)
+            return instance
+
+        return mapper
@@ -63,6 +63,15 @@ class ForbiddenException(AppException):
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, message=message)
 
 
+class TooManyRequestsException(AppException):
+    """
+    Exception for rejected work when the server is saturated.
+    """
+
+    def __init__(self, message: str = "Too many requests, try again later"):
+        super().__init__(status_code=status.HTTP_429_TOO_MANY_REQUESTS, message=message)
+
+
 class InternalFailureException(AppException):
     """
     Base exception for unknown errors.
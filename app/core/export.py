@@ -0,0 +1,127 @@
+import csv
+import enum
+import io
+import logging
+import traceback
+from datetime import date, datetime, time
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import Select
+from sqlalchemy.engine import Row
+
+from app.core.config import settings
+from app.core.database.session import SessionManager, session_manager
+from app.core.pagination.base_query import FilterQuery
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class ExportFormat(enum.StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ExportQuery(FilterQuery):
+    """Sorting and filtering of an export, with the syntax of the paginated lists, see 'PaginationFactory'"""
+
+    format: Optional[ExportFormat] = ExportFormat.CSV
+
+
+class Exporter:
+    """
+    Streams the rows of a select statement to the client as CSV or NDJSON.
+
+    Rows are read through a server side cursor in batches of 'EXPORT_FETCH_SIZE' and every batch is written to the
+    response before the next one is fetched. The statement runs on its own session, the session of the request is
+    closed once the endpoint returns, before the body is sent.
+    """
+
+    MEDIA_TYPES = {
+        ExportFormat.CSV: "text/csv; charset=utf-8",
+        ExportFormat.NDJSON: "application/x-ndjson",
+    }
+
+    @classmethod
+    def stream(
+        cls,
+        statement: Select,
+        /,
+        *,
+        format: ExportFormat = ExportFormat.CSV,
+        filename: str = "export",
+        manager: SessionManager | None = None,
+    ) -> StreamingResponse:
+        batches = cls._read(statement, manager or session_manager)
+        if format == ExportFormat.NDJSON:
+            body = cls._to_ndjson(batches)
+        else:
+            body = cls._to_csv(batches)
+
+        return StreamingResponse(
+            body,
+            media_type=cls.MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}.{format.value}"'
+            },
+        )
+
+    @classmethod
+    async def _read(
+        cls, statement: Select, manager: SessionManager
+    ) -> AsyncIterator[tuple[Sequence[str], Sequence[Row]]]:
+        try:
+            async with manager.session() as session:
+                result = await session.stream(
+                    statement.execution_options(yield_per=settings.EXPORT_FETCH_SIZE)
+                )
+                columns = list(result.keys())
+                # the header is sent even when there are no rows
+                yield columns, []
+                async for rows in result.partitions():
+                    yield columns, rows
+        except Exception as e:
+            # the status is already sent, the client sees a truncated body
+            logger.error(f"[Exporter]: Export failed: {e} {traceback.format_exc()}")
+            raise e
+
+    @classmethod
+    def _to_csv_value(cls, value: Any) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, enum.Enum):
+            return value.value
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        return value
+
+    @classmethod
+    async def _to_csv(
+        cls, batches: AsyncIterator[tuple[Sequence[str], Sequence[Row]]]
+    ) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        is_header_written = False
+        async for columns, rows in batches:
+            if not is_header_written:
+                writer.writerow(columns)
+                is_header_written = True
+            writer.writerows(
+                [cls._to_csv_value(value) for value in row] for row in rows
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    @classmethod
+    async def _to_ndjson(
+        cls, batches: AsyncIterator[tuple[Sequence[str], Sequence[Row]]]
+    ) -> AsyncIterator[bytes]:
+        async for columns, rows in batches:
+            if not rows:
+                continue
+            yield b"".join(
+                to_json(dict(zip(columns, row))) + b"\n" for row in rows
+            )
@@ -1,6 +1,6 @@
 
 
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TypeVar
 
 from app.core.schema import BaseModel
 
@@ -8,6 +8,7 @@ T = TypeVar(name="T")
 
 class PaginatedResult(BaseModel, Generic[T]):
     result: list[T]
-    total_records: int
+    total_records: Optional[int] = None
     size: int
     page: int
+    next_cursor: Optional[str] = None
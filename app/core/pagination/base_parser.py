@@ -1,6 +1,8 @@
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
-from sqlalchemy import Boolean, DateTime, Float, Integer
+from sqlalchemy import Date, DateTime
+
+from app.core.database.registry import get_converter
 
 from app.core.exceptions import BadRequestException
 from app.core.pagination.exceptions import InvalidDatetimeValue
@@ -28,32 +30,36 @@ class PaginationParser:
             )
 
     @classmethod
-    def convert_value(cls, *, value: Any, column_type: Any, field_name: str):
+    def convert_value(
+        cls,
+        *,
+        value: Any,
+        column_type: Any,
+        field_name: str,
+        converter: Optional[Callable[[str], Any]] = None,
+    ):
         """
         Convert value to appropriate type based on column type.
 
         :param value: String value to convert
         :param column_type: SQLAlchemy column type
+        :param converter: Precomputed converter of the column, see 'ModelMetadata.converters'
         :return: Converted value
         """
         try:
-            if isinstance(column_type, Integer):
-                return int(value)
-            if isinstance(column_type, Float):
-                return float(value)
-            if isinstance(column_type, Boolean):
-                return value == "true" or value == "1"
-            if isinstance(column_type, DateTime):
-                from datetime import datetime
+            if converter is None:
+                converter = get_converter(column_type)
+
+            if isinstance(column_type, (DateTime, Date)):
                 try:
-                    return datetime.fromisoformat(value)
+                    return converter(value)
                 except Exception:
                     raise InvalidDatetimeValue(
                         message=f"Expected type of '{field_name}' is '{str(column_type).lower()}', could not parse the value '{value}'"
                     )
-            return value
+            return converter(value)
         except InvalidDatetimeValue as e:
-            raise BadRequestException(detail=str(e))
+            raise BadRequestException(str(e))
         except Exception:
             raise ValueError(
                 f"Type of field '{field_name}' is '{str(column_type).lower()}' but value passed is: '{type(value).__name__}'"
@@ -1,3 +1,4 @@
+import enum
 from abc import ABC, abstractmethod
 from typing import Optional
 from pydantic import Field
@@ -6,9 +7,26 @@ from app.core.schema import BaseModel
 from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy import ColumnElement
 
-class PaginationQuery(BaseModel, ABC):
-    page: Optional[int] = Field(1, ge=1)
-    size: Optional[int] = Field(20, ge=1)
+
+class CountMode(enum.StrEnum):
+    """
+    How 'total_records' of a page is computed
+
+    EXACT: count(*) of the filtered query, ran concurrently with the page query.
+
+    ESTIMATE: planner estimate, 'pg_class.reltuples' when not filtered, otherwise the EXPLAIN row estimate.
+
+    NONE: no count, 'total_records' is null.
+    """
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+class FilterQuery(BaseModel, ABC):
+    """Sorting and filtering of a query, see 'PaginationFactory' for the syntax"""
+
     sort_by: Optional[str] = None
     filter_by: Optional[str] = None
 
@@ -19,3 +37,10 @@ class PaginationQuery(BaseModel, ABC):
     @abstractmethod
     def filter_fields() -> list[ColumnElement]:
         pass
+
+
+class PaginationQuery(FilterQuery):
+    page: Optional[int] = Field(1, ge=1)
+    size: Optional[int] = Field(20, ge=1)
+    cursor: Optional[str] = None
+    count: Optional[CountMode] = CountMode.EXACT
@@ -0,0 +1,176 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Optional
+
+from sqlalchemy import ColumnElement, and_, literal, or_, tuple_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from app.core.exceptions import BadRequestException
+
+
+class SortKey:
+    """A column of the ORDER BY clause and its direction"""
+
+    def __init__(self, column: ColumnElement, descending: bool):
+        self.column = column
+        self.descending = descending
+
+    @property
+    def name(self) -> str:
+        return self.column.key
+
+    def order_expression(self) -> ColumnElement:
+        return self.column.desc() if self.descending else self.column.asc()
+
+
+class PaginationCursor:
+    """
+    Opaque keyset cursor, a base64 encoded json of the sort key values of the last row of a page.
+
+    The cursor records the sort key names, so a cursor is only accepted with the sort it was created for.
+    Rows with a NULL sort key never compare past a cursor, sort on non nullable columns when seeking.
+    """
+
+    @classmethod
+    def get_sort_keys(
+        cls, order_clause: list[ColumnElement], id_column: ColumnElement
+    ) -> list[SortKey]:
+        """Split the order clause into sort keys, with the id as the last key to make the order total"""
+        sort_keys: list[SortKey] = []
+        for expression in order_clause:
+            if isinstance(expression, UnaryExpression) and expression.modifier in (
+                operators.desc_op,
+                operators.asc_op,
+            ):
+                sort_keys.append(
+                    SortKey(
+                        expression.element,
+                        expression.modifier is operators.desc_op,
+                    )
+                )
+            else:
+                sort_keys.append(SortKey(expression, False))
+
+        if not any(sort_key.name == id_column.key for sort_key in sort_keys):
+            # follow the direction of the other keys so the seek stays a single row comparison
+            descending = bool(sort_keys) and all(
+                sort_key.descending for sort_key in sort_keys
+            )
+            sort_keys.append(SortKey(id_column, descending))
+
+        return sort_keys
+
+    @classmethod
+    def encode(cls, sort_keys: list[SortKey], row: Any) -> str:
+        payload = {
+            "keys": [sort_key.name for sort_key in sort_keys],
+            "values": [
+                cls._to_json_value(getattr(row, sort_key.name))
+                for sort_key in sort_keys
+            ],
+        }
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode()
+
+    @classmethod
+    def decode(cls, cursor: str, sort_keys: list[SortKey]) -> list[Any]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            keys, values = payload["keys"], payload["values"]
+        except Exception:
+            raise BadRequestException("Invalid pagination cursor")
+
+        if keys != [sort_key.name for sort_key in sort_keys]:
+            raise BadRequestException(
+                "Pagination cursor does not match the requested sorting"
+            )
+
+        if not isinstance(values, list) or len(values) != len(sort_keys):
+            raise BadRequestException("Invalid pagination cursor")
+
+        return [
+            cls._from_json_value(value, sort_key)
+            for value, sort_key in zip(values, sort_keys)
+        ]
+
+    @classmethod
+    def seek_clause(
+        cls, sort_keys: list[SortKey], values: list[Any]
+    ) -> ColumnElement[bool]:
+        """
+        Rows strictly after the cursor in the sort order.
+
+        With a single direction it is a row comparison e.g. (start_at, id) > (:start_at, :id),
+        with mixed directions it is expanded to (a > :a) OR (a = :a AND b < :b) OR ...
+        """
+        directions = {sort_key.descending for sort_key in sort_keys}
+        if len(directions) == 1:
+            columns = tuple_(*[sort_key.column for sort_key in sort_keys])
+            cursor_values = tuple_(
+                *[
+                    literal(value, sort_key.column.type)
+                    for value, sort_key in zip(values, sort_keys)
+                ]
+            )
+            if sort_keys[0].descending:
+                return columns < cursor_values
+            return columns > cursor_values
+
+        conditions = []
+        for index, sort_key in enumerate(sort_keys):
+            equal_prefix = [
+                previous.column == value
+                for previous, value in zip(sort_keys[:index], values[:index])
+            ]
+            if sort_key.descending:
+                after = sort_key.column < values[index]
+            else:
+                after = sort_key.column > values[index]
+            conditions.append(and_(*equal_prefix, after))
+
+        return or_(*conditions)
+
+    @classmethod
+    def _to_json_value(cls, value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    @classmethod
+    def _from_json_value(cls, value: Any, sort_key: SortKey) -> Any:
+        """The sort key value of a cursor, only scalars of the column type are accepted"""
+        if value is None:
+            return value
+        if not isinstance(value, (str, int, float)):
+            raise BadRequestException("Invalid pagination cursor")
+
+        try:
+            python_type: Optional[type] = sort_key.column.type.python_type
+        except NotImplementedError:
+            return value
+
+        try:
+            if python_type is datetime:
+                return datetime.fromisoformat(value)
+            if python_type is date:
+                return date.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise BadRequestException("Invalid pagination cursor")
+
+        if python_type is bool:
+            is_valid = isinstance(value, bool)
+        elif python_type is int:
+            is_valid = isinstance(value, int) and not isinstance(value, bool)
+        elif python_type is float:
+            is_valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        elif python_type is str:
+            is_valid = isinstance(value, str)
+        else:
+            is_valid = True
+        if not is_valid:
+            raise BadRequestException("Invalid pagination cursor")
+
+        return value
@@ -1,4 +1,4 @@
-from functools import cached_property
+from functools import cached_property, lru_cache
 from typing import ClassVar
 from pydantic import field_validator
 from sqlalchemy import ColumnElement, asc, desc
@@ -7,83 +7,128 @@ from sqlalchemy.orm.attributes import InstrumentedAttribute
 from app.core.database import Base
 from app.core.exceptions import BadRequestException
 from app.core.pagination.base_parser import PaginationParser
-from app.core.pagination.base_query import PaginationQuery
-from app.core.pagination.exceptions import InvalidOperator
+from app.core.pagination.base_query import FilterQuery, PaginationQuery
 from app.core.pagination.operator import FieldOperation, LogicalOperator
 
 
+# Parsed plans are keyed by the raw query strings, bound the caches since filter values are part of the key
+PARSE_CACHE_SIZE = 1024
+
+SortPlan = tuple[tuple[str, bool], ...]
+FilterPlan = tuple[tuple[str, LogicalOperator, str], ...]
+
+
 class PaginationSortParser(PaginationParser):
+    @staticmethod
+    @lru_cache(maxsize=PARSE_CACHE_SIZE)
+    def parse_sort_fields(
+        model: Base, allowed_fields: frozenset[str], sort_by_str: str
+    ) -> SortPlan:
+        """
+        Parse and validate the sort query into (field, is_descending) pairs.
+
+        :param model: SQLAlchemy model class, part of the cache key
+        :return: The sort plan
+        """
+        sort_plan = []
+
+        for field in PaginationParser.split_and_clean_fields(sort_by_str):
+            if not field:
+                continue
+
+            clean_field = field.lstrip("-")
+            PaginationParser.validate_field(
+                field=clean_field, allowed_fields=sorted(allowed_fields)
+            )
+            sort_plan.append((clean_field, field.startswith("-")))
+
+        return tuple(sort_plan)
+
     def _process_sort_fields(
-        self, sort_by_str: str, model: Base
+        self, sort_plan: SortPlan, model: Base
     ) -> list[InstrumentedAttribute]:
         """
-        Process and validate sort fields.
+        Build the sort expressions of a parsed sort plan.
 
         :param model: SQLAlchemy model class
         :return: List of sort expressions
         """
-        # print(f"sort_by is: {sort_by_str}")
-        sort_fields = self.split_and_clean_fields(sort_by_str)
         sort_by = []
 
-        for field in sort_fields:
-            if not field:
-                continue
+        for field, is_descending in sort_plan:
+            column = getattr(model, field)
+            sort_by.append(desc(column) if is_descending else asc(column))
 
-            clean_field = field.lstrip("-")
-            is_descending = field.startswith("-")
+        return sort_by
+
+
+class PaginationFilterParser(PaginationParser):
+    @staticmethod
+    @lru_cache(maxsize=PARSE_CACHE_SIZE)
+    def parse_filter_fields(
+        model: Base, allowed_fields: frozenset[str], filter_by_str: str
+    ) -> FilterPlan:
+        """
+        Parse and validate the filter query into (field, operator, raw value) triples.
+
+        :param model: SQLAlchemy model class, part of the cache key
+        :return: The filter plan
+        """
+        filter_plan = []
+
+        for pair in PaginationParser.split_and_clean_fields(filter_by_str):
+            if not pair:
+                continue
 
             try:
-                column = getattr(model, clean_field)
-                sort_expr = desc(column) if is_descending else asc(column)
-                sort_by.append(sort_expr)
-            except Exception as e:
-                print(f"Invalid sort field {clean_field}: {e}")
+                operator: LogicalOperator = FieldOperation.determine_operator(pair)
 
-        return sort_by
+                field, value = pair.split(operator.value, 1)
+            except Exception:
+                raise ValueError(
+                    f"Invalid filter operator. Passed query is '{pair}'."
+                    f" Use '<field><op><value>' format where op could be: {LogicalOperator.all_values()}"
+                )
 
+            PaginationParser.validate_field(
+                field=field,
+                allowed_fields=sorted(allowed_fields),
+                error_message="Filtering not allowed on field '{field}'. Allowed fields are {allowed_fields}",
+            )
+            filter_plan.append((field, operator, value))
+
+        return tuple(filter_plan)
 
-class PaginationFilterParser(PaginationParser):
     def _process_filter_fields(
-        self, filter_by_str: str, model: Base
+        self, filter_plan: FilterPlan, model: Base
     ) -> list[ColumnElement]:
         """
-        Process and validate filter fields with type conversion.
+        Build the filter expressions of a parsed filter plan, only the values are converted per request.
 
         :param model: SQLAlchemy model class
         :return: List of filter expressions
         """
-        filter_fields = self.split_and_clean_fields(filter_by_str)
         filter_by = []
+        model_metadata = model.get_model_metadata()
 
-        for pair in filter_fields:
-            if not pair:
-                continue
-
-            operator: LogicalOperator = None
+        for key, operator, value in filter_plan:
             try:
-                operator = FieldOperation.determine_operator(pair)
-
-                key, value = pair.split(operator.value, 1)
-
                 column: InstrumentedAttribute = getattr(model, key)
 
                 converted_value = self.convert_value(
-                    value=value, column_type=column.type, field_name=key
+                    value=value,
+                    column_type=model_metadata.column_types[key],
+                    field_name=key,
+                    converter=model_metadata.converters[key],
                 )
 
-                # print(f"Converted value: {bool(value)} - {converted_value}")
-
                 sql_expr = FieldOperation.create_sql_expression(
                     column=column, operator=operator, column_value=converted_value
                 )
 
                 filter_by.extend(sql_expr)
-            except InvalidOperator:
-                print("Invalid oeprator passed")
             except ValueError as e:
-                # print(f"Invalid filter: {pair} {operator}")
-                raise BadRequestException(detail=str(e)) from e
+                raise BadRequestException(str(e)) from e
 
         return filter_by
 
@@ -96,7 +141,12 @@ class PaginationFactory:
         *,
         exclude_sort_fields: list[str] = [],
         exclude_filter_fields: list[str] = [],
+        base: type[FilterQuery] = PaginationQuery,
     ) -> PaginationQuery:
+        """
+        Create the query model of a model, 'base' is the query model to extend, e.g. a 'FilterQuery'
+        subclass for queries that are not paginated.
+        """
         filter_parser = PaginationFilterParser()
         sort_parser = PaginationSortParser()
 
@@ -108,31 +158,33 @@ class PaginationFactory:
         excluded_sort = set(exclude_sort_fields)
         excluded_filter = set(exclude_filter_fields)
 
-        sortable_fields = list(sort_fields - excluded_sort)
-        filterable_fields = list(filter_fields - excluded_filter)
+        sortable_fields = frozenset(sort_fields - excluded_sort)
+        filterable_fields = frozenset(filter_fields - excluded_filter)
 
-        class CustomPaginationQuery(PaginationQuery):
+        class CustomPaginationQuery(base):
             __model__: ClassVar[Base] = model
 
             @cached_property
             def sort_fields(self):
-                fields = sort_parser._process_sort_fields(self.sort_by, self.__model__)
-
-                if not fields:
+                if not self.sort_by:
                     return []
-                
-                return fields
 
-            @cached_property
-            def filter_fields(self):
-                fields = filter_parser._process_filter_fields(
-                    self.filter_by, self.__model__
+                sort_plan = sort_parser.parse_sort_fields(
+                    self.__model__, sortable_fields, self.sort_by
                 )
+                return sort_parser._process_sort_fields(sort_plan, self.__model__)
 
-                if not fields:
+            @cached_property
+            def filter_fields(self):
+                if not self.filter_by:
                     return []
-                
-                return fields
+
+                filter_plan = filter_parser.parse_filter_fields(
+                    self.__model__, filterable_fields, self.filter_by
+                )
+                return filter_parser._process_filter_fields(
+                    filter_plan, self.__model__
+                )
 
             @field_validator("sort_by")
             @classmethod
@@ -140,15 +192,8 @@ class PaginationFactory:
                 if not v:
                     return v
 
-                sort_fields = sort_parser.split_and_clean_fields(v)
-
-                for field in sort_fields:
-                    clean_field = field.lstrip("-")
-
-                    sort_parser.validate_field(
-                        field=clean_field, allowed_fields=sortable_fields
-                    )
-
+                # parsed plans are cached, the sort_fields property reuses this one
+                sort_parser.parse_sort_fields(model, sortable_fields, v)
                 return v
 
             @field_validator("filter_by")
@@ -156,32 +201,8 @@ class PaginationFactory:
             def validate_filter_fields(cls, v):
                 if not v:
                     return v
-                
-                filter_pairs = filter_parser.split_and_clean_fields(v)
-
-                error_message = "Filtering not allowed on field '{field}'. Allowed fields are {allowed_fields}"
-
-                for pair in filter_pairs:
-                    field = None
-
-                    try:
-                        operator: LogicalOperator = FieldOperation.determine_operator(
-                            pair
-                        )
-                
-                        field, _ = pair.split(operator.value, 1)
-
-                    except Exception:
-                        raise ValueError(
-                            f"Invalid filter operator. Passed query is '{pair}'."
-                            f" Use '<field><op><value>' format where op could be: {LogicalOperator.all_values()}"
-                        )
-
-                    filter_parser.validate_field(
-                        field=field,
-                        allowed_fields=filterable_fields,
-                        error_message=error_message,
-                    )
+
+                filter_parser.parse_filter_fields(model, filterable_fields, v)
                 return v
 
         return CustomPaginationQuery
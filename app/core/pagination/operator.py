@@ -1,5 +1,6 @@
 import enum
-from typing import Any
+import re
+from typing import Any, ClassVar
 
 from app.core.pagination.exceptions import InvalidOperator
 from sqlalchemy import ColumnElement
@@ -25,33 +26,24 @@ class LogicalOperator(enum.StrEnum):
 
 
 class FieldOperation:
+    # A single scan for the first '__<op>__' token, longer operators come first in the alternation
+    # so '__gte__' is not read as '__gt__'
+    OPERATOR_PATTERN: ClassVar[re.Pattern] = re.compile(
+        "|".join(
+            re.escape(operator.value)
+            for operator in sorted(
+                LogicalOperator, key=lambda operator: len(operator.value), reverse=True
+            )
+        )
+    )
+
     @classmethod
     def determine_operator(cls, field_str: str) -> LogicalOperator:
-        if LogicalOperator.GTE in field_str:
-            return LogicalOperator.GTE
-
-        if LogicalOperator.GT in field_str:
-            return LogicalOperator.GT
-
-        if LogicalOperator.LTE in field_str:
-            return LogicalOperator.LTE
-
-        if LogicalOperator.LT in field_str:
-            return LogicalOperator.LT
-
-        if LogicalOperator.NOT in field_str:
-            return LogicalOperator.NOT
-
-        if LogicalOperator.EQ in field_str:
-            return LogicalOperator.EQ
-
-        if LogicalOperator.NOT_ILIKE in field_str:
-            return LogicalOperator.NOT_ILIKE
-
-        if LogicalOperator.ILIKE in field_str:
-            return LogicalOperator.ILIKE
+        match = cls.OPERATOR_PATTERN.search(field_str)
+        if match is None:
+            raise InvalidOperator
 
-        raise InvalidOperator
+        return LogicalOperator(match.group())
 
     @classmethod
     def create_sql_expression(
@@ -0,0 +1,265 @@
+import hashlib
+import logging
+import traceback
+from typing import Awaitable, Callable, ClassVar, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.schema import AppResponse, dump_json
+from app.redis import RedisClient, get_redis_client
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+# KEYS: tag sets then tag versions of the same tags, every member of a tag set is a cached response key
+# ARGV: seconds a version is kept
+INVALIDATE_TAGS = """
+local count = #KEYS / 2
+local deleted = 0
+for i = 1, count do
+    local members = redis.call('SMEMBERS', KEYS[i])
+    for j = 1, #members do
+        deleted = deleted + redis.call('DEL', members[j])
+    end
+    redis.call('DEL', KEYS[i])
+    redis.call('INCR', KEYS[count + i])
+    redis.call('EXPIRE', KEYS[count + i], ARGV[1])
+end
+return deleted
+"""
+
+# KEYS: response, tag sets, then tag versions of the same tags
+# ARGV: etag, body, ttl, tag set ttl, members sampled for pruning, then the tag versions read before producing
+# The response is stored only when none of its tags was invalidated while it was produced
+STORE_IF_UNCHANGED = """
+local count = (#KEYS - 1) / 2
+for i = 1, count do
+    if (redis.call('GET', KEYS[1 + count + i]) or '0') ~= ARGV[5 + i] then
+        return 0
+    end
+end
+redis.call('HSET', KEYS[1], 'etag', ARGV[1], 'body', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+for i = 1, count do
+    -- responses that expired on their own are dropped from the set, a few per store
+    local members = redis.call('SRANDMEMBER', KEYS[1 + i], ARGV[5])
+    for j = 1, #members do
+        if redis.call('EXISTS', members[j]) == 0 then
+            redis.call('SREM', KEYS[1 + i], members[j])
+        end
+    end
+    -- a tag set outlives the responses it points to
+    redis.call('SADD', KEYS[1 + i], KEYS[1])
+    redis.call('EXPIRE', KEYS[1 + i], ARGV[4])
+end
+return 1
+"""
+
+# members of a tag set checked for expiry on every store, more than the single member a store adds
+TAG_PRUNE_SAMPLE = 4
+
+type CachedResponse = tuple[str, str]  # etag and serialized body
+
+
+class ResponseCache:
+    """
+    Read-through cache of serialized `AppResponse` bodies, keyed by route path and sorted query params.
+
+    Bodies are kept in redis for 'ttl' seconds and in process for at most RESPONSE_CACHE_LOCAL_TTL seconds.
+    Every cached response is added to the redis set of each of its tags, invalidating a tag deletes its responses,
+    in-process copies of other processes expire on their own.
+
+    Invalidating a tag also bumps its version, a response is only stored when the versions of its tags are the ones
+    read before producing it, so a producer that read the database before a change cannot cache its stale result.
+    """
+
+    _local: TTLCache[CachedResponse] = TTLCache(
+        maxsize=settings.RESPONSE_CACHE_LOCAL_SIZE, ttl=settings.RESPONSE_CACHE_LOCAL_TTL
+    )
+    # bumped on every invalidation, guards the in-process copies the same way
+    _generation: ClassVar[int] = 0
+
+    @classmethod
+    def get_cache_key(cls, request: Request, query: Optional[BaseModel] = None):
+        """
+        Key of the route path and the validated query model, params the route does not declare are left out so
+        they cannot create entries of their own.
+        """
+        params = {}
+        if query is not None:
+            params = query.model_dump(mode="json", by_alias=True, exclude_none=True)
+        return f"responses:{request.url.path}?{urlencode(sorted(params.items()))}"
+
+    @classmethod
+    def get_tag_key(cls, tag: str):
+        return f"responses:tags:{tag}"
+
+    @classmethod
+    def get_version_key(cls, tag: str):
+        return f"responses:versions:{tag}"
+
+    @classmethod
+    def make_etag(cls, body: str) -> str:
+        return f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+
+    @classmethod
+    def _get_redis_client(cls) -> Optional[RedisClient]:
+        redis_client = get_redis_client()
+        try:
+            # raises when the client is not connected
+            redis_client.client
+            return redis_client
+        except RuntimeError:
+            return None
+
+    @classmethod
+    async def _get_from_redis(
+        cls, redis_client: RedisClient, key: str, tags: list[str]
+    ) -> tuple[Optional[CachedResponse], Optional[list[str]]]:
+        """The cached response and, to store a response produced on a miss, the current versions of the tags"""
+        try:
+            async with redis_client.batch() as batch:
+                batch.hgetall(key)
+                for tag in tags:
+                    batch.get(cls.get_version_key(tag))
+
+            cached, *versions = batch.results
+            if not cached:
+                return None, [version or "0" for version in versions]
+            return (cached["etag"], cached["body"]), None
+        except Exception as e:
+            logger.error(
+                f"[ResponseCache]: Failed to read response: {key}: {e} {traceback.format_exc()}"
+            )
+            return None, None
+
+    @classmethod
+    async def _store(
+        cls,
+        redis_client: RedisClient,
+        key: str,
+        cached_response: CachedResponse,
+        tags: list[str],
+        versions: list[str],
+        ttl: int,
+    ) -> bool:
+        """Store the response unless one of its tags was invalidated since 'versions' were read"""
+        etag, body = cached_response
+        try:
+            is_stored = await redis_client.run_script(
+                STORE_IF_UNCHANGED,
+                [
+                    key,
+                    *[cls.get_tag_key(tag) for tag in tags],
+                    *[cls.get_version_key(tag) for tag in tags],
+                ],
+                [etag, body, ttl, settings.RESPONSE_CACHE_TTL, TAG_PRUNE_SAMPLE, *versions],
+            )
+            return bool(is_stored)
+        except Exception as e:
+            logger.error(
+                f"[ResponseCache]: Failed to store response: {key}: {e} {traceback.format_exc()}"
+            )
+            return False
+
+    @classmethod
+    def _to_response(cls, request: Request, cached_response: CachedResponse) -> Response:
+        etag, body = cached_response
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in [value.strip() for value in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    @classmethod
+    async def serve(
+        cls,
+        request: Request,
+        producer: Callable[[], Awaitable[AppResponse]],
+        /,
+        *,
+        tags: list[str],
+        query: Optional[BaseModel] = None,
+        ttl: int = settings.RESPONSE_CACHE_TTL,
+    ) -> Response:
+        """
+        Serve a cached response, or produce, cache and serve it.
+
+        Args:
+            producer: Builds the response on a cache miss, errors it raises are not cached
+            tags: Tags of the data in the response, see 'invalidate'
+            query: Query params model of the route, the only params the response is cached by
+            ttl: Seconds the response is kept in redis
+
+        Returns:
+            The JSON response with its ETag, or 304 when the client already has it
+        """
+        key = cls.get_cache_key(request, query)
+        local_ttl = min(settings.RESPONSE_CACHE_LOCAL_TTL, ttl)
+
+        cached_response = cls._local.get(key)
+        if cached_response is not None:
+            return cls._to_response(request, cached_response)
+
+        generation = cls._generation
+        versions = None
+        redis_client = cls._get_redis_client()
+        if redis_client:
+            cached_response, versions = await cls._get_from_redis(
+                redis_client, key, tags
+            )
+            if cached_response is not None:
+                cls._local.set(key, cached_response, ttl=local_ttl)
+                return cls._to_response(request, cached_response)
+
+        app_response = await producer()
+        body = dump_json(app_response).decode()
+        cached_response = (cls.make_etag(body), body)
+
+        is_stored = True
+        if redis_client:
+            # without the versions there is no way to tell whether the response is still current
+            is_stored = versions is not None and await cls._store(
+                redis_client, key, cached_response, tags, versions, ttl
+            )
+        if is_stored and generation == cls._generation:
+            cls._local.set(key, cached_response, ttl=local_ttl)
+
+        return cls._to_response(request, cached_response)
+
+    @classmethod
+    async def invalidate(cls, *tags: str) -> None:
+        """Drop every cached response of the passed tags, must be called after the change is committed"""
+        # in-process copies are short lived, dropping all of them is simpler than tracking their tags
+        cls._generation += 1
+        cls._local.clear()
+
+        redis_client = cls._get_redis_client()
+        if redis_client is None or not tags:
+            return
+
+        try:
+            await redis_client.run_script(
+                INVALIDATE_TAGS,
+                [
+                    *[cls.get_tag_key(tag) for tag in tags],
+                    *[cls.get_version_key(tag) for tag in tags],
+                ],
+                # versions must outlive any response produced before the invalidation
+                [settings.RESPONSE_CACHE_TTL],
+            )
+        except Exception as e:
+            logger.error(
+                f"[ResponseCache]: Failed to invalidate tags: {tags}: {e} {traceback.format_exc()}"
+            )
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return cls._local.stats()
@@ -1,4 +1,5 @@
-from typing import Generic, Optional, TypeVar
+from typing import Any, Generic, Optional, TypeVar
+from fastapi.responses import JSONResponse
 from pydantic import AliasGenerator, BaseModel as OrigModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 
@@ -12,6 +13,31 @@ class BaseModel(OrigModel):
 T = TypeVar("T")
 
 
+def dump_json(model: OrigModel) -> bytes:
+    """
+    Serialize a model straight to JSON bytes by alias.
+
+    Uses the serializer pydantic compiled for the model class, every generic specialization e.g. 'AppResponse[Genre]'
+    is its own cached class with its own serializer. Fields typed 'Any' or an unbound 'T' are serialized with the
+    serializer of the runtime class of their value.
+    """
+    return model.__pydantic_serializer__.to_json(model, by_alias=True)
+
+
+class AppJSONResponse(JSONResponse):
+    """
+    JSON response rendering pydantic models with 'dump_json', other content is rendered like 'JSONResponse'.
+
+    An endpoint returning it skips the validation of its result against the route 'response_model', only return it
+    when the result is already the declared model, fields the response_model would filter out are not filtered.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, OrigModel):
+            return dump_json(content)
+        return super().render(content)
+
+
 class AppResponse(BaseModel, Generic[T]):
     success: bool = Field(description="Is operation success", default=True)
     status_code: Optional[int] = Field(description="status code", default=200)
@@ -22,3 +48,9 @@ class AppResponse(BaseModel, Generic[T]):
     @classmethod
     def create_response(cls, data: T):
         return AppResponse(data=data)
+
+    @classmethod
+    def create_json_response(cls, data: T) -> AppJSONResponse:
+        """Like 'create_response' but serialized on the fast path, see 'AppJSONResponse'"""
+        response = cls.create_response(data)
+        return AppJSONResponse(response, status_code=response.status_code)
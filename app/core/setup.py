@@ -5,6 +5,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import Settings, get_settings
 from app.api import api_router
 from app.core.database import session_manager
+from app.core.database.registry import ModelRegistry
+from app.core.auth.password import get_password_hasher
 from app.models import *  # noqa: F403
 
 
@@ -23,11 +25,16 @@ class FastApp(FastAPI):
 
     @asynccontextmanager
     async def _lifespan(self, _: Self, /) -> AsyncGenerator[None, Any]:
+        # fail fast on inconsistent models instead of on the first request using them
+        ModelRegistry.validate()
+
         redis_client: RedisClient = get_redis_client()
         is_connected = await redis_client.connect()
         if is_connected:
             logger.info("[RedisClient] is connected successfully!")
         yield
+        get_password_hasher().shutdown()
+        await redis_client.disconnect()
         engine = session_manager.engine
         await engine.dispose()
 
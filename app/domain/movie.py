@@ -19,6 +19,17 @@ class MovieBase(BaseModelDatabaseMixin):
     class MoviePagination(PaginationFactory.create(MovieModel)):
         pass
 
+class MovieSummary(BaseModelDatabaseMixin):
+    """A movie in listings, without its description"""
+
+    model: ClassVar[type[MovieModel]] = MovieModel
+
+    id: int
+    title: str
+    rating: int
+    image_url: str
+
+
 class MovieWithGenres(MovieBase):
     @classmethod
     def relations(cls):
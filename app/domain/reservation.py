@@ -1,7 +1,8 @@
 import enum
 from datetime import datetime
-from typing import ClassVar, Optional
+from typing import Any, ClassVar, Optional
 from app.core.database.mixin import BaseModelDatabaseMixin
+from app.core.export import ExportQuery
 from app.core.pagination.factory import PaginationFactory
 from app.dto.seat import SeatDto
 from app.dto.showtime import ShowtimeDto
@@ -52,9 +53,8 @@ class ReservationBase(BaseModelDatabaseMixin):
     class Pagination(PaginationFactory.create(ReservationModel)):
         pass
 
-    @classmethod
-    def get_cache_key(cls, reservation_id: int):
-        return f"reservations:{reservation_id}:task"
+    class Export(PaginationFactory.create(ReservationModel, base=ExportQuery)):
+        pass
 
 
 class ReservationWithRelations(ReservationBase):
@@ -67,3 +67,16 @@ class ReservationWithRelations(ReservationBase):
 
     showtime: Optional[ShowtimeDto] = None
     seat: Optional[SeatDto] = None
+
+    @classmethod
+    def from_loaded(
+        cls, reservation: ReservationModel, showtime: Any, seat: Any
+    ) -> "ReservationWithRelations":
+        """Build from a reservation row and relations already in hand, without loading them again"""
+        data = {
+            field: getattr(reservation, field) for field in ReservationBase.model_fields
+        }
+        data["showtime"] = ShowtimeDto.model_validate(showtime, from_attributes=True)
+        data["seat"] = SeatDto.model_validate(seat, from_attributes=True)
+
+        return cls.model_validate(data)
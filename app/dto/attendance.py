@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import Field
+
+from app.core.schema import BaseModel
+
+MAX_SCANS_PER_BATCH = 5000
+
+
+class AttendanceScanDto(BaseModel):
+    reservation_id: int
+    scanned_at: Optional[datetime] = None
+
+
+class AttendanceBatchDto(BaseModel):
+    scans: list[AttendanceScanDto] = Field(
+        min_length=1, max_length=MAX_SCANS_PER_BATCH
+    )
+
+
+class AttendanceIngestResult(BaseModel):
+    show_time_id: int
+    ingested: int
+
+
+class ShowtimeCompletionResult(BaseModel):
+    show_time_id: int
+    completed: int
+    no_show: int
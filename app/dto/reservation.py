@@ -1,18 +1,31 @@
 from app.core.schema import BaseModel
 from typing import Optional
 from datetime import datetime
-from pydantic import Field
+from pydantic import Field, field_validator
 
 from app.domain.reservation import (
     ReservationBase as Reservation,
     ReservationWithRelations,
 )
 
+MAX_SEATS_PER_HOLD = 10
+
 
 class ReservationCreate(BaseModel):
     show_time_id: int
     seat_id: int
-    reserved_at: Optional[datetime] = Field(default=datetime.now())
+
+
+class ReservationManyCreate(BaseModel):
+    show_time_id: int
+    seat_ids: list[int] = Field(min_length=1, max_length=MAX_SEATS_PER_HOLD)
+
+    @field_validator("seat_ids")
+    @classmethod
+    def validate_unique_seats(cls, v: list[int]):
+        if len(set(v)) != len(v):
+            raise ValueError("Seat ids must be unique")
+        return v
 
 
 class ReservationShowtime(BaseModel):
@@ -19,6 +19,18 @@ celery.conf.beat_schedule = {
     "check_confirmed_reservations": {
         "task": "app.jobs.tasks.complete_reservations.convert_reservations_to_complete",
         "schedule": timedelta(seconds=settings.TRANSFORM_TO_COMPLETE_INTERVAL),
-    }
+    },
+    "sweep_expired_holds": {
+        "task": "app.jobs.tasks.sweep_expired_holds.sweep_expired_holds",
+        "schedule": timedelta(seconds=settings.HOLD_SWEEP_INTERVAL),
+    },
+    "reconcile_showtime_counters": {
+        "task": "app.jobs.tasks.reconcile_showtime_counters.reconcile_showtime_counters",
+        "schedule": timedelta(seconds=settings.RECONCILE_COUNTERS_INTERVAL),
+    },
+    "rebuild_revenue_rollups": {
+        "task": "app.jobs.tasks.rebuild_revenue_rollups.rebuild_revenue_rollups",
+        "schedule": timedelta(seconds=settings.REBUILD_REVENUE_ROLLUPS_INTERVAL),
+    },
 }
 celery.conf.timezone = "UTC"
@@ -0,0 +1,167 @@
+import asyncio
+import functools
+import logging
+import threading
+import traceback
+from typing import Any, Awaitable, Callable, ClassVar, Coroutine, Optional, ParamSpec, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+from app.core.config import settings
+from app.core.database.session import SessionManager, get_engine_kwargs
+from app.core.database.url import DATABASE_URL
+from app.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """
+    Event loop and database engine of a celery worker process, shared by all its async tasks.
+
+    The loop runs forever in a daemon thread, tasks submit their coroutine to it and block until it is done,
+    so connections of the engine and the redis pool always stay on the loop that opened them, whatever the pool
+    of the worker. Started on 'worker_process_init', or on the first task when the worker does not fork.
+    """
+
+    loop: ClassVar[Optional[asyncio.AbstractEventLoop]] = None
+    session_manager: ClassVar[Optional[SessionManager]] = None
+    _thread: ClassVar[Optional[threading.Thread]] = None
+    _semaphores: ClassVar[dict[str, asyncio.Semaphore]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def start(cls) -> None:
+        with cls._lock:
+            if cls.loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="worker-runtime-loop", daemon=True
+            )
+            thread.start()
+
+            engine_kwargs = get_engine_kwargs(settings)
+            engine_kwargs["pool_size"] = settings.JOB_DB_POOL_SIZE
+            engine_kwargs["max_overflow"] = settings.JOB_DB_MAX_OVERFLOW
+            cls.session_manager = SessionManager(DATABASE_URL, kwargs=engine_kwargs)
+            cls.loop = loop
+            cls._thread = thread
+            cls._semaphores = {}
+
+        is_connected = asyncio.run_coroutine_threadsafe(
+            get_redis_client().connect(), loop
+        ).result()
+        logger.info(f"[WorkerRuntime]: started, redis connected: {is_connected}")
+
+    @classmethod
+    def stop(cls) -> None:
+        with cls._lock:
+            loop, thread, session_manager = cls.loop, cls._thread, cls.session_manager
+            if loop is None:
+                return
+            cls.loop = None
+            cls._thread = None
+            cls.session_manager = None
+
+        async def close():
+            await get_redis_client().disconnect()
+            await session_manager.close()
+
+        try:
+            asyncio.run_coroutine_threadsafe(close(), loop).result(
+                timeout=settings.JOB_SHUTDOWN_TIMEOUT
+            )
+        except Exception as e:
+            logger.error(
+                f"[WorkerRuntime]: Failed to close connections: {e} {traceback.format_exc()}"
+            )
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=settings.JOB_SHUTDOWN_TIMEOUT)
+            if thread.is_alive():
+                # a running loop cannot be closed, the daemon thread ends with the process
+                logger.error(
+                    f"[WorkerRuntime]: loop did not stop within {settings.JOB_SHUTDOWN_TIMEOUT}s, leaving it running"
+                )
+            else:
+                loop.close()
+                logger.info("[WorkerRuntime]: stopped")
+
+    @classmethod
+    def get_session_manager(cls) -> SessionManager:
+        if cls.session_manager is None:
+            cls.start()
+        return cls.session_manager
+
+    @classmethod
+    def _get_semaphore(cls, name: str, limit: int) -> asyncio.Semaphore:
+        # only called on the loop thread
+        semaphore = cls._semaphores.get(name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(limit)
+            cls._semaphores[name] = semaphore
+        return semaphore
+
+    @classmethod
+    def run(
+        cls,
+        coroutine: Coroutine[Any, Any, T],
+        /,
+        *,
+        name: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> T:
+        """
+        Run a coroutine on the loop of this process and wait for its result.
+
+        Args:
+            name: Coroutines sharing a name share the concurrency 'limit'
+            limit: Maximum number of coroutines of 'name' running at once in this process
+        """
+        if cls.loop is None:
+            cls.start()
+
+        async def limited():
+            if name is None or limit is None:
+                return await coroutine
+            async with cls._get_semaphore(name, limit):
+                return await coroutine
+
+        return asyncio.run_coroutine_threadsafe(limited(), cls.loop).result()
+
+
+def async_task(
+    *, limit: Optional[int] = None
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, T]]:
+    """
+    Turn a coroutine function into a sync function running it on the 'WorkerRuntime' loop, meant to be
+    wrapped by '@celery.task'. At most 'limit' runs of the task are executing at once in a worker process.
+    """
+
+    def decorator(function: Callable[P, Awaitable[T]]) -> Callable[P, T]:
+        name = f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            return WorkerRuntime.run(function(*args, **kwargs), name=name, limit=limit)
+
+        return wrapper
+
+    return decorator
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**_: Any) -> None:
+    WorkerRuntime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _on_worker_shutdown(**_: Any) -> None:
+    WorkerRuntime.stop()
@@ -1,4 +1,11 @@
-from .check_confirmed_reservation import check_if_confirmed
+from .sweep_expired_holds import sweep_expired_holds
 from .complete_reservations import convert_reservations_to_complete
+from .reconcile_showtime_counters import reconcile_showtime_counters
+from .rebuild_revenue_rollups import rebuild_revenue_rollups
 
-__all__ = [check_if_confirmed, convert_reservations_to_complete]
+__all__ = [
+    sweep_expired_holds,
+    convert_reservations_to_complete,
+    reconcile_showtime_counters,
+    rebuild_revenue_rollups,
+]
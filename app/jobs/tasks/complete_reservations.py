@@ -1,89 +1,57 @@
-import asyncio
-from datetime import datetime, timedelta, timezone
+import time
 import traceback
 
-from app.core.database import session_manager
 from app.core.config import settings
 from app.jobs.celery import celery
+from app.jobs.runtime import WorkerRuntime, async_task
+from app.redis import get_redis_client
 
 import logging
 
-from app.services.showtime import Showtime
-from app.models import Showtime as ShowtimeModel
+from app.services.showtime_counter import ShowtimeCounter
 
 logger = logging.getLogger(__name__)
 
 
 @celery.task
-def convert_reservations_to_complete() -> bool:
-    """For a given show that ended, mark all confirmed reservations as COMPLETE"""
-
-    async def do_job():
-        from app.services.reservation import Reservation
-
-        try:
-            logger.info("[CompleteReservationsJob]: started job...")
-            async with session_manager.session() as session:
-                showtimes_ready_to_process: list[
-                    ShowtimeModel
-                ] = await Showtime.get_all(
-                    session,
-                    where_clause=[
-                        Showtime.model.is_processed_for_completion == False,  # noqa: E712
-                        Showtime.model.end_at
-                        < datetime.now(tz=timezone.utc)
-                        - timedelta(minutes=settings.OFFSET_DELAY_MINUTES),
-                    ],
-                    return_as_base=True,
+@async_task(limit=1)
+async def convert_reservations_to_complete() -> int:
+    """
+    For every show that ended, settle all confirmed reservations as COMPLETE or NO_SHOW by their attendance scans,
+    in batches of COMPLETE_BATCH_SIZE showtimes.
+    Each batch is committed on its own, so a failed run resumes from the first unprocessed showtime.
+    """
+    from app.services.reservation import Reservation
+
+    try:
+        logger.info("[CompleteReservationsJob]: started job...")
+        redis_client = get_redis_client()
+
+        processed = 0
+        async with WorkerRuntime.get_session_manager().session() as session:
+            while True:
+                started_at = time.monotonic()
+                showtime_ids, counts = await Reservation.complete_ended_showtimes(
+                    session, settings.COMPLETE_BATCH_SIZE
                 )
-
                 logger.info(
-                    f"Got {len(showtimes_ready_to_process)} showtimes for processing"
+                    f"[CompleteReservationsJob]: processed {len(showtime_ids)} showtimes, "
+                    f"completed {counts.get(Reservation.Status.COMPLETE, 0)} and "
+                    f"marked {counts.get(Reservation.Status.NO_SHOW, 0)} reservations as no show "
+                    f"in {(time.monotonic() - started_at) * 1000:.1f} ms"
                 )
-                if (
-                    showtimes_ready_to_process is None
-                    or len(showtimes_ready_to_process) == 0
-                ):
-                    logger.info(
-                        "[CompleteReservationsJob]: No showtimes to process...exiting"
-                    )
-                    return True
 
-                showtime_ids = []
-                for showtime in showtimes_ready_to_process:
-                    showtime_ids.append(showtime.id)
+                if showtime_ids:
+                    # CONFIRMED reservations of these showtimes are COMPLETE now
+                    await ShowtimeCounter.forget(redis_client, showtime_ids)
+                processed += len(showtime_ids)
 
-                # Update reservation
-                reservation_update_data = {
-                    "status": Reservation.Status.COMPLETE,
-                    "updated_at": datetime.now(),
-                }
-                reservation_where_clause = [
-                    Reservation.model.show_time_id.in_(showtime_ids),
-                    Reservation.model.status == Reservation.Status.CONFIRMED,
-                ]
-                await Reservation.update_many_by_whereclause(
-                    session,
-                    reservation_update_data,
-                    reservation_where_clause,
-                    commit=False,
-                )
-
-                # Update showtime
-                showtime_update = {
-                    "is_processed_for_completion": True,
-                    "updated_at": datetime.now(),
-                }
-                showtime_where_clause = [Showtime.model.id.in_(showtime_ids)]
-                await Showtime.update_many_by_whereclause(
-                    session, showtime_update, showtime_where_clause, commit=False
-                )
-                await session.commit()
-                return True
-        except Exception as e:
-            logger.error(
-                f"[CompleteReservationsJob]: Failed to execute task for deleting session: {e} {traceback.format_exc()}"
-            )
+                if len(showtime_ids) < settings.COMPLETE_BATCH_SIZE:
+                    break
 
-    running_loop = asyncio.get_event_loop()
-    return running_loop.run_until_complete(do_job())
+        logger.info(f"[CompleteReservationsJob]: processed {processed} showtimes")
+        return processed
+    except Exception as e:
+        logger.error(
+            f"[CompleteReservationsJob]: Failed to execute task for completing reservations: {e} {traceback.format_exc()}"
+        )
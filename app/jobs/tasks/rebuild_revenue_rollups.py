@@ -0,0 +1,32 @@
+import time
+import traceback
+
+from app.jobs.celery import celery
+from app.jobs.runtime import WorkerRuntime, async_task
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+@async_task(limit=1)
+async def rebuild_revenue_rollups() -> None:
+    """Recompute every revenue rollup from the paid reservations, repairing any drift of the incremental updates"""
+    # import here avoids circular imports issue
+    from app.services.revenue_rollup import RevenueRollup
+
+    try:
+        logger.info("[RebuildRevenueRollupsJob]: started job...")
+        started_at = time.monotonic()
+
+        async with WorkerRuntime.get_session_manager().session() as session:
+            await RevenueRollup.rebuild(session)
+            await session.commit()
+
+        logger.info(
+            f"[RebuildRevenueRollupsJob]: rebuilt rollups in {time.monotonic() - started_at:.3f}s"
+        )
+    except Exception as e:
+        logger.error(
+            f"[RebuildRevenueRollupsJob]: Failed to execute task for rebuilding revenue rollups: {e} {traceback.format_exc()}"
+        )
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+import traceback
+
+from sqlalchemy import select
+
+from app.jobs.celery import celery
+from app.jobs.runtime import WorkerRuntime, async_task
+from app.redis import get_redis_client
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+@async_task(limit=1)
+async def reconcile_showtime_counters() -> int:
+    """Recount the HELD and CONFIRMED counters of every showtime that has not ended yet"""
+    # import here avoids circular imports issue
+    from app.services.showtime import Showtime
+    from app.services.showtime_counter import ShowtimeCounter
+
+    try:
+        logger.info("[ReconcileShowtimeCountersJob]: started job...")
+        redis_client = get_redis_client()
+
+        async with WorkerRuntime.get_session_manager().session() as session:
+            showtime_ids = list(
+                await session.scalars(
+                    select(Showtime.model.id).where(
+                        Showtime.model.end_at >= datetime.now(tz=timezone.utc)
+                    )
+                )
+            )
+            await ShowtimeCounter.reconcile(session, redis_client, showtime_ids)
+
+        logger.info(
+            f"[ReconcileShowtimeCountersJob]: reconciled {len(showtime_ids)} showtimes"
+        )
+        return len(showtime_ids)
+    except Exception as e:
+        logger.error(
+            f"[ReconcileShowtimeCountersJob]: Failed to execute task for reconciling counters: {e} {traceback.format_exc()}"
+        )
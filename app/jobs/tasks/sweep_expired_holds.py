@@ -0,0 +1,39 @@
+import traceback
+
+from app.core.config import settings
+from app.jobs.celery import celery
+from app.jobs.runtime import WorkerRuntime, async_task
+from app.redis import get_redis_client
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+@async_task(limit=1)
+async def sweep_expired_holds() -> int:
+    """Delete every HELD reservation older than HELD_STATUS_TIMER, in batches of HOLD_SWEEP_BATCH_SIZE"""
+    # import here avoids circular imports issue
+    from app.services.reservation import Reservation
+
+    try:
+        logger.info("[SweepExpiredHoldsJob]: started job...")
+        redis_client = get_redis_client()
+
+        reclaimed = 0
+        async with WorkerRuntime.get_session_manager().session() as session:
+            while True:
+                batch_reclaimed = await Reservation.sweep_expired_holds(
+                    session, redis_client, settings.HOLD_SWEEP_BATCH_SIZE
+                )
+                reclaimed += batch_reclaimed
+
+                if batch_reclaimed < settings.HOLD_SWEEP_BATCH_SIZE:
+                    break
+
+        logger.info(f"[SweepExpiredHoldsJob]: reclaimed {reclaimed} holds")
+        return reclaimed
+    except Exception as e:
+        logger.error(
+            f"[SweepExpiredHoldsJob]: Failed to execute task for sweeping holds: {e} {traceback.format_exc()}"
+        )
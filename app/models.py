@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List
-from sqlalchemy import VARCHAR, DateTime, ForeignKey, Index, UniqueConstraint, func
+from sqlalchemy import VARCHAR, Date, DateTime, ForeignKey, Index, UniqueConstraint, func
 from app.core.database.base import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -147,4 +147,56 @@ class Reservation(Base):
             # if the status is NOT HELD and NOT CONFIRMED (e.g., CANCELED, NO_SHOW, COMPLETED).
             postgresql_where=((status == "HELD") | (status == "CONFIRMED")),
         ),
+        # Lookup of expired holds by the sweeper job
+        Index("ix_reservations_status_reserved_at", "status", "reserved_at"),
+    )
+
+
+class AttendanceScan(Base):
+    """
+    Staging table of scanned tickets, filled with COPY and emptied once the showtime is completed.
+    Scans of unknown reservations are not rejected, they simply match no reservation.
+    """
+
+    __tablename__ = "attendance_scans"
+
+    show_time_id: Mapped[int] = mapped_column(
+        ForeignKey("showtimes.id"), nullable=False
+    )
+    reservation_id: Mapped[int] = mapped_column(nullable=False)
+    scanned_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        # Lookup of the scans of a reservation when completing its showtime
+        Index(
+            "ix_attendance_scans_show_time_id_reservation_id",
+            "show_time_id",
+            "reservation_id",
+        ),
+    )
+
+
+class RevenueRollup(Base):
+    """
+    Paid tickets and revenue per movie, theatre, showtime date and reservation status.
+    Kept up to date by the reservation transitions, see 'RevenueRollup.apply'.
+    """
+
+    __tablename__ = "revenue_rollups"
+
+    movie_id: Mapped[int] = mapped_column(ForeignKey("movies.id"), nullable=False)
+    theatre_id: Mapped[int] = mapped_column(ForeignKey("theatres.id"), nullable=False)
+    show_date: Mapped[date] = mapped_column(Date, nullable=False)
+    status: Mapped[str] = mapped_column(VARCHAR(64), nullable=False)
+    tickets: Mapped[int] = mapped_column(nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "movie_id", "theatre_id", "show_date", "status", name="uc_revenue_rollup"
+        ),
+        # Reports read one status over a date range
+        Index("ix_revenue_rollups_status_show_date", "status", "show_date"),
     )
@@ -1,8 +1,17 @@
 import json
 import traceback
-from typing import Any, Coroutine, Optional, Union
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Coroutine, Mapping, Optional, Union
 from pydantic import BaseModel, Field
 import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.client import NEVER_DECODE
+from redis.commands.core import AsyncScript
+from redis.exceptions import ConnectionError, TimeoutError
+
+from app.redis.pool import InstrumentedConnectionPool
 
 import logging
 
@@ -12,12 +21,20 @@ logger.setLevel(logging.INFO)
 
 
 class RedisClientConfig(BaseModel):
+    url: Optional[str] = Field(default=None)
     host: Optional[str] = Field(default="localhost")
     password: Optional[str] = Field(default=None)
     db: Optional[int] = Field(default=0)
     port: Optional[int] = Field(default=6379)
     decode_responses: Optional[bool] = Field(default=True)
-    max_connections: Optional[int] = Field(default=10)
+    max_connections: Optional[int] = Field(default=50)
+    pool_timeout: Optional[float] = Field(default=2)
+    socket_timeout: Optional[float] = Field(default=5)
+    socket_connect_timeout: Optional[float] = Field(default=2)
+    health_check_interval: Optional[int] = Field(default=30)
+    retry_attempts: Optional[int] = Field(default=3)
+    retry_backoff_base: Optional[float] = Field(default=0.05)
+    retry_backoff_cap: Optional[float] = Field(default=1)
 
 
 class RedisClient:
@@ -25,32 +42,82 @@ class RedisClient:
         """Initial Async Redis client
             Args:
                 - redis_config: Configuration Connection for Redis instance
+                    - url: Redis server url, takes precedence over host, port, db and password
                     - host: Redis server host
                     - port: Redis server port
                     - db: Redis database number
                     - password: Redis password (if required)
                     - decode_responses: Whether to decode responses to strings
-                    - max_connections: Maximum number of connections in the pool        
-        """        
+                    - max_connections: Maximum number of connections in the pool
+                    - pool_timeout: Seconds to wait for a free connection once the pool is exhausted
+                    - socket_timeout: Seconds to wait for a command response
+                    - socket_connect_timeout: Seconds to wait for a connection to open
+                    - health_check_interval: Seconds of idleness after which a connection is checked before use
+                    - retry_attempts: Retries of a command failing with a connection error or timeout
+                    - retry_backoff_base: Base seconds of the exponential backoff between retries
+                    - retry_backoff_cap: Maximum seconds of the backoff between retries
+        """
         self._config = redis_config
         self._client: Optional[redis.Redis] = None
+        self._pool: Optional[InstrumentedConnectionPool] = None
+        self._scripts: dict[str, AsyncScript] = {}
+
+    def _create_pool(self) -> InstrumentedConnectionPool:
+        config = self._config
+        pool_kwargs = {
+            "max_connections": config.max_connections,
+            "timeout": config.pool_timeout,
+            "socket_timeout": config.socket_timeout,
+            "socket_connect_timeout": config.socket_connect_timeout,
+            "health_check_interval": config.health_check_interval,
+            "decode_responses": config.decode_responses,
+            "retry": Retry(
+                ExponentialBackoff(
+                    cap=config.retry_backoff_cap, base=config.retry_backoff_base
+                ),
+                config.retry_attempts,
+                supported_errors=(ConnectionError, TimeoutError),
+            ),
+        }
+        if config.url:
+            return InstrumentedConnectionPool.from_url(config.url, **pool_kwargs)
+
+        return InstrumentedConnectionPool(
+            host=config.host,
+            port=config.port,
+            db=config.db,
+            password=config.password,
+            **pool_kwargs,
+        )
 
     async def connect(self) -> Coroutine[Any, Any, bool]:
         """ Connect to the redis instance """
         try:
             if not self._client:
-                self._client = redis.Redis(**self._config.model_dump())
+                self._pool = self._create_pool()
+                self._client = redis.Redis.from_pool(self._pool)
             return await self._client.ping()
         except Exception as e:
             logger.error(f"An error occured while connecting: {e} {traceback.format_exc()}")
             return False
 
     async def disconnect(self):
-        """ Disconnect the redis client """
+        """ Disconnect the redis client and close every connection of its pool """
         try:
-            await self.disconnect()
+            if self._client:
+                await self._client.aclose()
         except Exception as e:
             logger.error(f"An error occured disconnecting: {e} {traceback.format_exc()}")
+        finally:
+            self._client = None
+            self._pool = None
+            self._scripts = {}
+
+    def stats(self) -> dict[str, Any]:
+        """Connection pool usage, empty when not connected"""
+        if self._pool is None:
+            return {}
+        return self._pool.stats()
     
 
     @property
@@ -144,8 +211,248 @@ class RedisClient:
         """
         return await self.client.exists(*keys)
 
+    async def get_bytes(self, key: str, /) -> Optional[bytes]:
+        """
+        Get the raw value of a key without decoding it, e.g. for bitmaps.
+
+        Args:
+            key: The key to retrieve
+
+        Returns:
+            The raw bytes or None if key doesn't exist
+        """
+        return await self.client.execute_command("GET", key, **{NEVER_DECODE: True})
+
+    async def mget(self, keys: list[str], /, *, as_json: bool = False) -> list[Any]:
+        """
+        Get the values of several keys in one round trip.
+
+        Args:
+            keys: The keys to retrieve
+            as_json: Whether to parse the values as JSON
+
+        Returns:
+            The values in the order of the keys, None for missing keys
+        """
+        if not keys:
+            return []
+
+        values = await self.client.mget(keys)
+        if not as_json:
+            return values
+
+        return [self._loads(value) for value in values]
+
+    async def mset(
+        self, mapping: Mapping[str, Any], /, *, ex: Optional[int] = None
+    ) -> bool:
+        """
+        Set several key-value pairs in one round trip, values are JSON-serialized if not a string.
+
+        Args:
+            mapping: Keys and their values
+            ex: Expiration time in seconds, applied to every key
+
+        Returns:
+            True if successful
+        """
+        if not mapping:
+            return True
+
+        payload = {key: self._dumps(value) for key, value in mapping.items()}
+        if ex is None:
+            return bool(await self.client.mset(payload))
+
+        # MSET has no expiration, SET EX of every key is sent as one transaction instead
+        async with self.client.pipeline(transaction=True) as pipe:
+            for key, value in payload.items():
+                pipe.set(key, value, ex=ex)
+            results = await pipe.execute()
+        return all(results)
+
+    async def hgetall(self, key: str, /) -> dict[str, str]:
+        """
+        Get all fields of a hash.
+
+        Returns:
+            The fields and their values, empty if the hash doesn't exist
+        """
+        return await self.client.hgetall(key)
+
+    async def hset(self, key: str, mapping: Mapping[str, Any], /) -> int:
+        """
+        Set fields of a hash.
+
+        Returns:
+            Number of added fields
+        """
+        return await self.client.hset(key, mapping=dict(mapping))
+
+    async def incrby(self, key: str, amount: int = 1, /) -> int:
+        """
+        Increment the integer value of a key, a missing key counts as 0.
+
+        Returns:
+            The value after the increment
+        """
+        return await self.client.incrby(key, amount)
+
+    def register_script(self, script: str) -> AsyncScript:
+        """
+        Register a Lua script, calls run it with EVALSHA and load it on the server only when it is missing.
+
+        Registered scripts are cached by their source, so registering the same source again is free.
+        """
+        registered = self._scripts.get(script)
+        if registered is None:
+            registered = self.client.register_script(script)
+            self._scripts[script] = registered
+        return registered
+
+    async def run_script(
+        self,
+        script: str,
+        keys: list[str],
+        args: list[Any],
+        /,
+        *,
+        pipeline: Optional[Pipeline] = None,
+    ) -> Any:
+        """
+        Run a Lua script with EVALSHA.
+
+        Args:
+            script: The Lua source
+            keys: Keys accessed by the script (KEYS table)
+            args: Extra arguments (ARGV table)
+            pipeline: Queue the call on a pipeline instead of sending it
+
+        Returns:
+            The script result, or the pipeline when queued
+        """
+        return await self.register_script(script)(keys, args, client=pipeline)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[Pipeline]:
+        """
+        Pipeline context, queued commands are sent in a single round trip with 'await pipe.execute()'.
+
+        Args:
+            transaction: Wrap the queued commands in MULTI/EXEC
+        """
+        async with self.client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+
+    @asynccontextmanager
+    async def batch(self, transaction: bool = False) -> AsyncIterator["RedisBatch"]:
+        """
+        Batch context, every command queued in the block is sent in a single round trip when it exits.
+
+        Results are available on 'batch.results' after the block, in the order the commands were queued.
+        """
+        async with self.pipeline(transaction=transaction) as pipe:
+            batch = RedisBatch(self, pipe)
+            yield batch
+            await batch.execute()
+
+    def _dumps(self, value: Any) -> Union[str, bytes]:
+        if not isinstance(value, (str, bytes)):
+            return json.dumps(value)
+        return value
+
+    def _loads(self, value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+
+    async def eval(self, script: str, keys: list[str], args: list[Any]) -> Any:
+        """
+        Run a Lua script on the server.
+
+        Args:
+            script: The Lua source
+            keys: Keys accessed by the script (KEYS table)
+            args: Extra arguments (ARGV table)
+
+        Returns:
+            The script result
+        """
+        return await self.client.eval(script, len(keys), *keys, *args)
+
+class RedisBatch:
+    """Commands queued on a pipeline of a RedisClient, see 'RedisClient.batch'"""
+
+    def __init__(self, redis_client: RedisClient, pipeline: Pipeline):
+        self._redis_client = redis_client
+        self.pipeline = pipeline
+        self.results: list[Any] = []
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        /,
+        *,
+        ex: Optional[int] = None,
+        nx: bool = False,
+    ) -> "RedisBatch":
+        self.pipeline.set(key, self._redis_client._dumps(value), ex=ex, nx=nx)
+        return self
+
+    def get(self, key: str, /) -> "RedisBatch":
+        self.pipeline.get(key)
+        return self
+
+    def delete(self, *keys: str) -> "RedisBatch":
+        self.pipeline.delete(*keys)
+        return self
+
+    def expire(self, key: str, seconds: int, /) -> "RedisBatch":
+        self.pipeline.expire(key, seconds)
+        return self
+
+    def hset(self, key: str, mapping: Mapping[str, Any], /) -> "RedisBatch":
+        self.pipeline.hset(key, mapping=dict(mapping))
+        return self
+
+    def hgetall(self, key: str, /) -> "RedisBatch":
+        self.pipeline.hgetall(key)
+        return self
+
+    def incrby(self, key: str, amount: int = 1, /) -> "RedisBatch":
+        self.pipeline.incrby(key, amount)
+        return self
+
+    def sadd(self, key: str, *members: str) -> "RedisBatch":
+        self.pipeline.sadd(key, *members)
+        return self
+
+    async def run_script(
+        self, script: str, keys: list[str], args: list[Any], /
+    ) -> "RedisBatch":
+        await self._redis_client.run_script(script, keys, args, pipeline=self.pipeline)
+        return self
+
+    async def execute(self) -> list[Any]:
+        self.results = await self.pipeline.execute()
+        return self.results
+
+
 redis_client: RedisClient | None = None
-redis_config: RedisClientConfig = RedisClientConfig(host=settings.REDIS_SERVER)
+redis_config: RedisClientConfig = RedisClientConfig(
+    # REDIS_SERVER is either a redis:// url or a bare host
+    url=settings.REDIS_SERVER if "://" in settings.REDIS_SERVER else None,
+    host=settings.REDIS_SERVER,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    pool_timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+    retry_attempts=settings.REDIS_RETRY_ATTEMPTS,
+    retry_backoff_cap=settings.REDIS_RETRY_BACKOFF_CAP,
+)
 
 def get_redis_client():
     global redis_client
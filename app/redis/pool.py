@@ -0,0 +1,61 @@
+import asyncio
+import time
+from typing import Any
+
+from redis.asyncio.connection import BlockingConnectionPool
+from redis.exceptions import ConnectionError
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    Blocking connection pool that records how long callers wait for a connection and how often it fails.
+
+    Callers block up to 'timeout' seconds when every connection is in use, instead of failing right away.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.acquired = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def get_connection(self, *args: Any, **kwargs: Any):
+        started_at = time.monotonic()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except ConnectionError as e:
+            # waiting for a free connection timed out, otherwise connecting failed
+            if isinstance(e.__cause__, asyncio.TimeoutError):
+                self.timeouts += 1
+            else:
+                self.errors += 1
+            raise
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+
+        waited = time.monotonic() - started_at
+        self.acquired += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return connection
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "avg_wait_ms": round(
+                self.total_wait_seconds / self.acquired * 1000, 3
+            )
+            if self.acquired
+            else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
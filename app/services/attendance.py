@@ -0,0 +1,154 @@
+import codecs
+import csv
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterable
+
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import BadRequestException, NotFoundException
+from app.domain.showtime import ShowtimeBase as Showtime
+from app.models import AttendanceScan as AttendanceScanModel
+
+type ScanRecord = tuple[int, int, datetime]  # show_time_id, reservation_id, scanned_at
+
+CSV_READ_SIZE = 64 * 1024
+
+
+class Attendance:
+    """
+    Ingestion of scanned tickets into the 'attendance_scans' staging table.
+
+    Scans are streamed into the table with COPY, they are applied when the showtime is completed,
+    by the completion job or by 'Reservation.complete_showtime'.
+    """
+
+    COLUMNS = ["show_time_id", "reservation_id", "scanned_at"]
+
+    @classmethod
+    async def _copy(cls, session: AsyncSession, records: list[ScanRecord]) -> None:
+        # COPY runs on the connection of the session, within its transaction
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            AttendanceScanModel.__tablename__, records=records, columns=cls.COLUMNS
+        )
+
+    @classmethod
+    async def _lock_open_showtime(cls, session: AsyncSession, showtime_id: int) -> None:
+        # FOR SHARE until the ingest commits: the completion job skips the showtime and a manual completion waits,
+        # so scans are never copied after the showtime was settled
+        is_processed = await session.scalar(
+            select(Showtime.model.is_processed_for_completion)
+            .where(Showtime.model.id == showtime_id)
+            .with_for_update(read=True)
+        )
+        if is_processed is None:
+            raise NotFoundException()
+        if is_processed:
+            raise BadRequestException("Showtime is already completed")
+
+    @classmethod
+    async def ingest(
+        cls,
+        session: AsyncSession,
+        showtime_id: int,
+        scans: Iterable[tuple[int, datetime | None]] | AsyncIterator[tuple[int, datetime | None]],
+    ) -> int:
+        """
+        Copy the scans of a showtime into the staging table, 'ATTENDANCE_COPY_BATCH_SIZE' rows per COPY, and commit.
+
+        Args:
+            scans: Reservation ids and scan times, a missing scan time defaults to now, naive times are UTC
+
+        Raises:
+            BadRequestException: if the showtime is already completed or a scan is invalid
+
+        Returns:
+            Number of ingested scans
+        """
+        await cls._lock_open_showtime(session, showtime_id)
+
+        if not hasattr(scans, "__aiter__"):
+            scans = cls._to_async_iterator(scans)
+
+        ingested = 0
+        now = datetime.now(tz=timezone.utc)
+        records: list[ScanRecord] = []
+        async for reservation_id, scanned_at in scans:
+            if scanned_at is None:
+                scanned_at = now
+            elif scanned_at.tzinfo is None:
+                scanned_at = scanned_at.replace(tzinfo=timezone.utc)
+            records.append((showtime_id, reservation_id, scanned_at))
+            if len(records) >= settings.ATTENDANCE_COPY_BATCH_SIZE:
+                await cls._copy(session, records)
+                ingested += len(records)
+                records = []
+
+        if records:
+            await cls._copy(session, records)
+            ingested += len(records)
+
+        await session.commit()
+        return ingested
+
+    @classmethod
+    async def _to_async_iterator(cls, scans: Iterable[tuple[int, datetime | None]]):
+        for scan in scans:
+            yield scan
+
+    @classmethod
+    async def read_csv(
+        cls, file: UploadFile
+    ) -> AsyncIterator[tuple[int, datetime | None]]:
+        """
+        Stream the scans of an uploaded CSV file, with a 'reservation_id' column and an optional ISO 8601
+        'scanned_at' column.
+
+        Raises:
+            BadRequestException: on a missing column or an invalid row
+        """
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        header: list[str] | None = None
+        line_number = 0
+        pending = ""
+
+        while True:
+            chunk = await file.read(CSV_READ_SIZE)
+            pending += decoder.decode(chunk, final=not chunk)
+            lines = pending.splitlines(keepends=True)
+            # the last line may be cut in the middle until the file is read to the end
+            pending = ""
+            if chunk and lines and not lines[-1].endswith(("\n", "\r")):
+                pending = lines.pop()
+
+            for row in csv.reader(lines):
+                line_number += 1
+                if not row:
+                    continue
+                if header is None:
+                    header = [column.strip() for column in row]
+                    if "reservation_id" not in header:
+                        raise BadRequestException("CSV must have a 'reservation_id' column")
+                    continue
+                yield cls._parse_row(header, row, line_number)
+
+            if not chunk:
+                break
+
+    @classmethod
+    def _parse_row(
+        cls, header: list[str], row: list[str], line_number: int
+    ) -> tuple[int, datetime | None]:
+        try:
+            values = dict(zip(header, row))
+            scanned_at = values.get("scanned_at")
+            return (
+                int(values["reservation_id"]),
+                datetime.fromisoformat(scanned_at) if scanned_at else None,
+            )
+        except (KeyError, ValueError):
+            raise BadRequestException(f"Invalid scan on line {line_number}")
@@ -1,5 +1,69 @@
+from typing import Any, ClassVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.response_cache import ResponseCache
 from app.domain.genre import GenreBase
 
 
 class Genre(GenreBase):
-    pass
+    # movie responses embedding genre titles are tagged with it
+    CACHE_TAG: ClassVar[str] = "genres"
+
+    @classmethod
+    async def invalidate_cache(cls) -> None:
+        await ResponseCache.invalidate(cls.CACHE_TAG)
+
+    @classmethod
+    async def update_one(
+        cls,
+        session: AsyncSession,
+        data: GenreBase,
+        /,
+        *,
+        where_clause: list[ColumnElement[bool]] | None = None,
+        commit: bool = True,
+        return_as_base: bool = False,
+    ) -> GenreBase:
+        try:
+            data = await super().update_one(
+                session,
+                data,
+                where_clause=where_clause,
+                commit=commit,
+                return_as_base=return_as_base,
+            )
+            if data and commit:
+                await cls.invalidate_cache()
+            return data
+        except Exception as e:
+            raise e
+
+    @classmethod
+    async def delete_one(
+        cls,
+        session: AsyncSession,
+        val: Any,
+        /,
+        *,
+        field: InstrumentedAttribute | None = None,
+        where_clause: list[ColumnElement[bool]] = None,
+        commit: bool = True,
+        return_as_base: bool = False,
+    ):
+        try:
+            deleted_genre = await super().delete_one(
+                session,
+                val,
+                field=field,
+                where_clause=where_clause,
+                commit=commit,
+                return_as_base=return_as_base,
+            )
+            if deleted_genre and commit:
+                await cls.invalidate_cache()
+            return deleted_genre
+        except Exception as e:
+            raise e
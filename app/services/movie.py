@@ -1,12 +1,18 @@
 import logging
 import traceback
 
+from typing import Any, ClassVar
+
 from fastapi import HTTPException
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
 
+from app.core.response_cache import ResponseCache
 from app.models import Movie as MovieModel
 
 from app.services.genre import Genre
 from app.services.movie_genre import MovieGenre
+from app.services.showtime import Showtime
 from app.domain.movie import MovieBase, MovieWithGenres
 from app.dto.movie import MovieCreateDto, MovieUpdateDto
 
@@ -17,6 +23,19 @@ logger.setLevel(logging.INFO)
 
 
 class Movie(MovieBase):
+    CACHE_TAG: ClassVar[str] = "movies"
+
+    @classmethod
+    def get_cache_tag(cls, movie_id: int):
+        return f"movies:{movie_id}"
+
+    @classmethod
+    async def invalidate_cache(cls, movie_id: int) -> None:
+        """Drop cached movie responses, showtime responses embed the movie so they are dropped as well"""
+        await ResponseCache.invalidate(
+            cls.CACHE_TAG, cls.get_cache_tag(movie_id), Showtime.CACHE_TAG
+        )
+
     @classmethod
     async def update_one(
         cls,
@@ -84,6 +103,7 @@ class Movie(MovieBase):
 
             if commit:
                 await session.commit()
+                await cls.invalidate_cache(updated_movie.id)
 
             if return_as_base:
                 return updated_movie
@@ -140,6 +160,7 @@ class Movie(MovieBase):
 
             if commit:
                 await session.commit()
+                await cls.invalidate_cache(created_movie.id)
 
             if return_as_base:
                 return created_movie
@@ -151,6 +172,33 @@ class Movie(MovieBase):
             logger.info(f"Error in creating movie: {traceback.format_exc()}")
             raise e
 
+    @classmethod
+    async def delete_one(
+        cls,
+        session: AsyncSession,
+        val: Any,
+        /,
+        *,
+        field: InstrumentedAttribute | None = None,
+        where_clause: list[ColumnElement[bool]] = None,
+        commit: bool = True,
+        return_as_base: bool = False,
+    ):
+        try:
+            deleted_movie = await super().delete_one(
+                session,
+                val,
+                field=field,
+                where_clause=where_clause,
+                commit=commit,
+                return_as_base=return_as_base,
+            )
+            if deleted_movie and commit:
+                await cls.invalidate_cache(deleted_movie.id)
+            return deleted_movie
+        except Exception as e:
+            raise e
+
     @classmethod
     async def get_one(
         cls,
@@ -163,6 +211,7 @@ class Movie(MovieBase):
         options=None,
         return_as_base=False,
         raise_not_found=True,
+        trusted=None,
     ) -> MovieWithGenres:
         return await MovieWithGenres.get_one(
             session,
@@ -172,4 +221,5 @@ class Movie(MovieBase):
             options=options,
             return_as_base=return_as_base,
             raise_not_found=raise_not_found,
+            trusted=trusted,
         )
@@ -1,46 +1,69 @@
-from sqlalchemy import func, select, text
+from datetime import date
+from typing import Optional
+
+from pydantic import Field
+from sqlalchemy import Select, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.export import ExportQuery
+from app.core.pagination.factory import PaginationFactory
 from app.domain.movie import MovieBase
 from app.domain.reservation import ReservationBase
-from app.domain.showtime import ShowtimeBase
+from app.services.revenue_rollup import RevenueRollup
 
 from app.dto.reporting import RevenueRecord, RevenueType
 
 
 class Reporting:
+    class RevenueExport(PaginationFactory.create(RevenueRollup.model, base=ExportQuery)):
+        # same names as the parameters of the revenue report
+        type: RevenueType = Field(default=RevenueType.REALIZED, alias="type")
+        from_date: Optional[date] = Field(
+            default=None, alias="from_date", description="First showtime date, inclusive"
+        )
+        to_date: Optional[date] = Field(
+            default=None, alias="to_date", description="Last showtime date, inclusive"
+        )
+        theatre_id: Optional[int] = Field(default=None, alias="theatre_id")
+
+    @classmethod
+    def get_reservation_status(cls, type: RevenueType) -> str:
+        if type == RevenueType.REALIZED:
+            return ReservationBase.Status.COMPLETE
+        if type == RevenueType.POTENTIAL:
+            return ReservationBase.Status.CONFIRMED
+        raise ValueError("Unknown revenue type")
+
     @classmethod
     async def get_revenue(
-        cls, session: AsyncSession, type: RevenueType = RevenueType.REALIZED
+        cls,
+        session: AsyncSession,
+        type: RevenueType = RevenueType.REALIZED,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        theatre_id: Optional[int] = None,
     ) -> list[RevenueRecord]:
+        """Revenue per movie read from the revenue rollups, optionally of a showtime date range and a theatre"""
         try:
-            if type == RevenueType.REALIZED:
-                reservation_status = ReservationBase.Status.COMPLETE
-            elif type == RevenueType.POTENTIAL:
-                reservation_status = ReservationBase.Status.CONFIRMED
-            else:
-                raise ValueError("Unknown revenue type")
+            reservation_status = cls.get_reservation_status(type)
 
+            rollup = RevenueRollup.model
             query = (
                 select(
                     MovieBase.model.title,
                     MovieBase.model.id,
-                    func.sum(ReservationBase.model.final_price).label("revenue"),
-                    func.count(ReservationBase.model.id).label("sold_tickets"),
-                )
-                .join(
-                    ShowtimeBase.model,
-                    ShowtimeBase.model.movie_id == MovieBase.model.id,
-                )
-                .join(
-                    ReservationBase.model,
-                    ReservationBase.model.show_time_id == ShowtimeBase.model.id,
+                    func.sum(rollup.revenue).label("revenue"),
+                    func.sum(rollup.tickets).label("sold_tickets"),
                 )
+                .join(rollup, rollup.movie_id == MovieBase.model.id)
                 .where(
-                    ReservationBase.model.status == reservation_status,
-                    ReservationBase.model.is_paid,
+                    *RevenueRollup.where_clause(
+                        reservation_status, from_date, to_date, theatre_id
+                    )
                 )
                 .group_by(MovieBase.model.title, MovieBase.model.id)
+                # rollups stay behind at zero once all their tickets moved to another status
+                .having(func.sum(rollup.tickets) > 0)
                 .order_by(text("revenue DESC"))
             )
 
@@ -64,3 +87,38 @@ class Reporting:
 
         except Exception as e:
             raise e
+
+    @classmethod
+    def get_revenue_export_statement(cls, query: "Reporting.RevenueExport") -> Select:
+        """
+        Revenue rollups per movie, theatre and showtime date, the rows behind 'get_revenue', filtered and sorted
+        by the export query, then ordered by date, movie and theatre.
+        """
+        rollup = RevenueRollup.model
+        return (
+            select(
+                rollup.movie_id,
+                MovieBase.model.title.label("movie_title"),
+                rollup.theatre_id,
+                rollup.show_date,
+                rollup.tickets.label("sold_tickets"),
+                rollup.revenue,
+            )
+            .join(MovieBase.model, rollup.movie_id == MovieBase.model.id)
+            .where(
+                *RevenueRollup.where_clause(
+                    cls.get_reservation_status(query.type),
+                    query.from_date,
+                    query.to_date,
+                    query.theatre_id,
+                ),
+                rollup.tickets > 0,
+                *query.filter_fields,
+            )
+            .order_by(
+                *query.sort_fields,
+                rollup.show_date,
+                rollup.movie_id,
+                rollup.theatre_id,
+            )
+        )
@@ -1,23 +1,54 @@
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import ColumnElement
-from app.jobs.utils import revoke_celery_task
-from app.models import Reservation as ReservationModel
+from sqlalchemy import ColumnElement, Select, case, delete, exists, func, select, update
+from sqlalchemy.exc import IntegrityError
+from app.models import AttendanceScan as AttendanceScanModel, Reservation as ReservationModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
 from app.core.config import settings
+from app.core.exceptions import AlreadyExistException, BadRequestException
 
 from app.domain.showtime import ShowtimeBase as Showtime
 from app.domain.reservation import ReservationBase, ReservationWithRelations
-from app.jobs.tasks import check_if_confirmed
+from app.domain.seat import SeatBase
 from app.redis import RedisClient
+from app.services.seat_hold import SeatHold
+from app.services.seat_map import SeatMap
+from app.services.revenue_rollup import RevenueRollup
+from app.services.showtime_counter import ShowtimeCounter
 
-from app.dto.reservation import ReservationCreate
+from app.dto.reservation import ReservationCreate, ReservationManyCreate
 
 
 # Service Layer
 class Reservation(ReservationBase):
+    @classmethod
+    async def get_bookable_showtime(
+        cls, session: AsyncSession, showtime_id: int
+    ) -> Showtime:
+        return await Showtime.get_one(
+            session,
+            showtime_id,
+            where_clause=[  # ensure not accessing a showtime in past
+                Showtime.model.start_at
+                >= datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            ],
+        )
+
+    @classmethod
+    async def get_showtime_seats(
+        cls, session: AsyncSession, showtime: Showtime, seat_ids: list[int]
+    ) -> dict[int, SeatBase]:
+        """Get the requested seats from the showtime theatre layout, all of them must belong to it"""
+        seats = await SeatMap.get_seats(session, showtime.theatre_id, seat_ids)
+
+        if len(seats) != len(seat_ids):
+            raise BadRequestException("Seat does not belong to the showtime theatre")
+
+        return seats
+
     @classmethod
     async def create_held(
         cls,
@@ -31,18 +62,13 @@ class Reservation(ReservationBase):
         return_as_base: bool = False,
     ) -> ReservationWithRelations:
         try:
-            showtime = await Showtime.get_one(
-                session,
-                data.show_time_id,
-                where_clause=[  # ensure not accessing a showtime in past
-                    Showtime.model.start_at
-                    >= datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                ],
-            )
+            showtime = await cls.get_bookable_showtime(session, data.show_time_id)
+            seat = await cls.get_showtime_seats(session, showtime, [data.seat_id])
+
             reservation_data = Reservation(
                 show_time_id=data.show_time_id,
                 seat_id=data.seat_id,
-                reserved_at=data.reserved_at,
+                reserved_at=datetime.now(tz=timezone.utc),
                 user_id=user_id,
                 is_paid=False,
                 is_refunded=False,
@@ -50,23 +76,124 @@ class Reservation(ReservationBase):
                 final_price=showtime.base_ticket_cost,
             )
 
-            created_reservation = await cls.create(
-                session, reservation_data, commit=commit, return_as_base=return_as_base
+            created_reservation: ReservationModel = await cls.create(
+                session, reservation_data, commit=False, return_as_base=True
             )
+            await session.flush()
 
-            task_result = check_if_confirmed.apply_async(
-                (created_reservation.id,),
-                eta=datetime.now() + timedelta(seconds=settings.HELD_STATUS_TIMER),
+            is_held = await SeatHold.acquire(
+                redis_client,
+                data.show_time_id,
+                {data.seat_id: created_reservation.id},
             )
+            if not is_held:
+                await session.rollback()
+                raise AlreadyExistException("Seat is already held")
 
-            await redis_client.set(
-                cls.get_cache_key(created_reservation.id), task_result.id, ex=1800
+            if commit:
+                await session.commit()
+
+            await SeatMap.mark(
+                session,
+                redis_client,
+                data.show_time_id,
+                [data.seat_id],
+                booked=True,
             )
-            reservation_detail = await ReservationWithRelations.get_one(
-                session, created_reservation.id
+            await ShowtimeCounter.increment(
+                redis_client, data.show_time_id, {cls.Status.HELD: 1}
             )
 
-            return reservation_detail
+            if return_as_base:
+                return created_reservation
+
+            return ReservationWithRelations.from_loaded(
+                created_reservation, showtime, seat[data.seat_id]
+            )
+        except IntegrityError as e:
+            await session.rollback()
+            raise AlreadyExistException("Seat is already reserved") from e
+        except Exception as e:
+            raise e
+
+    @classmethod
+    async def create_held_many(
+        cls,
+        session: AsyncSession,
+        data: ReservationManyCreate,
+        user_id: int,
+        redis_client: RedisClient,
+        /,
+        *,
+        commit: bool = True,
+        return_as_base: bool = False,
+    ) -> list[ReservationWithRelations]:
+        """Hold several seats of a showtime together, either all of them are HELD or none"""
+        try:
+            showtime = await cls.get_bookable_showtime(session, data.show_time_id)
+            seats = await cls.get_showtime_seats(session, showtime, data.seat_ids)
+            reserved_at = datetime.now(tz=timezone.utc)
+
+            reservations_data = [
+                Reservation(
+                    show_time_id=data.show_time_id,
+                    seat_id=seat_id,
+                    reserved_at=reserved_at,
+                    user_id=user_id,
+                    is_paid=False,
+                    is_refunded=False,
+                    status=cls.Status.HELD,
+                    final_price=showtime.base_ticket_cost,
+                )
+                for seat_id in data.seat_ids
+            ]
+
+            # A single multi-row INSERT, the partial unique index 'uc_showtime_seat' rejects the whole group
+            created_reservations: list[ReservationModel] = await cls.create_many(
+                session, reservations_data, commit=False, return_as_base=True
+            )
+
+            # The group shares one hold TTL, so it expires and gets swept together
+            is_held = await SeatHold.acquire(
+                redis_client,
+                data.show_time_id,
+                {
+                    reservation.seat_id: reservation.id
+                    for reservation in created_reservations
+                },
+            )
+            if not is_held:
+                await session.rollback()
+                raise AlreadyExistException("One or more seats are already held")
+
+            if commit:
+                await session.commit()
+
+            await SeatMap.mark(
+                session,
+                redis_client,
+                data.show_time_id,
+                data.seat_ids,
+                booked=True,
+            )
+            await ShowtimeCounter.increment(
+                redis_client,
+                data.show_time_id,
+                {cls.Status.HELD: len(created_reservations)},
+            )
+
+            if return_as_base:
+                return created_reservations
+
+            return [
+                ReservationWithRelations.from_loaded(
+                    reservation, showtime, seats[reservation.seat_id]
+                )
+                for reservation in created_reservations
+            ]
+        except IntegrityError as e:
+            await session.rollback()
+            raise AlreadyExistException("One or more seats are already reserved") from e
         except Exception as e:
             raise e
 
@@ -80,33 +207,56 @@ class Reservation(ReservationBase):
         payment_id: str | None = None,
     ) -> ReservationWithRelations:
         try:
-            reservation_found: ReservationModel = (
-                await ReservationWithRelations.get_one(
+            if payment_id != "DUMMY_PAYMENT_ID_123":
+                raise ValueError("Payment not confirmed")
+
+            # Allowed states for changing to CONFIRM state are: HELD
+            reservation_confirmed: ReservationModel = (
+                await ReservationWithRelations.update_one(
                     session,
-                    reservation_id,
+                    {"status": cls.Status.CONFIRMED, "is_paid": True},
+                    where_clause=[
+                        cls.model.id == reservation_id,
+                        cls.model.user_id == user_id,
+                        cls.model.status == cls.Status.HELD,
+                    ],
+                    commit=False,
                     return_as_base=True,
-                    where_clause=[cls.model.user_id == user_id],
                 )
             )
-            # Allowed states for changing to CONFIRM state are: HELD
-            if reservation_found.status != cls.Status.HELD:
+            if not reservation_confirmed:
                 raise ValueError("Cannot modify this reservation")
 
-            if payment_id != "DUMMY_PAYMENT_ID_123":
-                raise ValueError("Payment not confirmed")
-
-            reservation_found.status = cls.Status.CONFIRMED
-            reservation_found.is_paid = True
-
-            task_id = await redis_client.get(cls.get_cache_key(reservation_found.id))
-
-            if task_id:
-                revoke_celery_task(task_id)
+            # The hold must still be alive, otherwise the seat may be given away by now
+            is_released = await SeatHold.release(
+                redis_client,
+                reservation_confirmed.show_time_id,
+                reservation_confirmed.seat_id,
+                reservation_confirmed.id,
+            )
+            if not is_released:
+                await session.rollback()
+                raise ValueError("Reservation hold has expired")
 
+            await RevenueRollup.apply(
+                session,
+                RevenueRollup.move(
+                    reservation_confirmed.show_time_id,
+                    reservation_confirmed.final_price,
+                    to_status=cls.Status.CONFIRMED,
+                ),
+            )
             await session.commit()
 
+            # HELD -> CONFIRMED keeps the seat booked, the seat map stays as is
+            await ShowtimeCounter.increment(
+                redis_client,
+                reservation_confirmed.show_time_id,
+                {cls.Status.HELD: -1, cls.Status.CONFIRMED: 1},
+            )
+
             return ReservationWithRelations.model_validate(
-                reservation_found.dict(), from_attributes=True
+                reservation_confirmed, from_attributes=True
             )
         except Exception as e:
             raise e
@@ -116,18 +266,46 @@ class Reservation(ReservationBase):
         cls,
         session: AsyncSession,
         reservation_id: int,
+        redis_client: RedisClient,
     ) -> ReservationWithRelations:
         try:
+            # conditional on the status, a concurrent completion must not be overwritten
             reservation_found: ReservationModel = (
+                await ReservationWithRelations.update_one(
+                    session,
+                    {"status": cls.Status.NO_SHOW},
+                    where_clause=[
+                        cls.model.id == reservation_id,
+                        cls.model.status == cls.Status.CONFIRMED,
+                    ],
+                    commit=False,
+                    return_as_base=True,
+                )
+            )
+            if not reservation_found:
+                # raises if the reservation does not exist
                 await ReservationWithRelations.get_one(
                     session, reservation_id, return_as_base=True
                 )
-            )
-            if reservation_found.status != Reservation.Status.CONFIRMED:
                 raise ValueError("Cannot modify this reservation")
-            reservation_found.status = Reservation.Status.NO_SHOW
+            if reservation_found.is_paid:
+                await RevenueRollup.apply(
+                    session,
+                    RevenueRollup.move(
+                        reservation_found.show_time_id,
+                        reservation_found.final_price,
+                        from_status=cls.Status.CONFIRMED,
+                        to_status=cls.Status.NO_SHOW,
+                    ),
+                )
             await session.commit()
 
+            await ShowtimeCounter.increment(
+                redis_client,
+                reservation_found.show_time_id,
+                {cls.Status.CONFIRMED: -1},
+            )
+
             return ReservationWithRelations.model_validate(
                 reservation_found.dict(), from_attributes=True
             )
@@ -136,28 +314,276 @@ class Reservation(ReservationBase):
 
     @classmethod
     async def update_canceled(
-        cls, session: AsyncSession, reservation_id: int, user_id: int
+        cls,
+        session: AsyncSession,
+        reservation_id: int,
+        user_id: int,
+        redis_client: RedisClient,
     ) -> ReservationWithRelations:
         try:
+            # conditional on the status, a concurrent completion must not be overwritten
             reservation_found: ReservationModel = (
+                await ReservationWithRelations.update_one(
+                    session,
+                    {"status": cls.Status.CANCELED},
+                    where_clause=[
+                        cls.model.id == reservation_id,
+                        cls.model.user_id == user_id,
+                        cls.model.status == cls.Status.CONFIRMED,
+                    ],
+                    commit=False,
+                    return_as_base=True,
+                )
+            )
+            if not reservation_found:
+                # raises if the reservation does not exist
                 await ReservationWithRelations.get_one(
                     session,
                     reservation_id,
                     return_as_base=True,
                     where_clause=[cls.model.user_id == user_id],
                 )
-            )
-            if reservation_found.status != Reservation.Status.CONFIRMED:
                 raise ValueError("Only confirmed statuses can be canceled")
 
-            reservation_found.status = Reservation.Status.CANCELED
+            if reservation_found.is_paid:
+                await RevenueRollup.apply(
+                    session,
+                    RevenueRollup.move(
+                        reservation_found.show_time_id,
+                        reservation_found.final_price,
+                        from_status=cls.Status.CONFIRMED,
+                        to_status=cls.Status.CANCELED,
+                    ),
+                )
             await session.commit()
+
+            await SeatMap.mark(
+                session,
+                redis_client,
+                reservation_found.show_time_id,
+                [reservation_found.seat_id],
+                booked=False,
+            )
+            await ShowtimeCounter.increment(
+                redis_client,
+                reservation_found.show_time_id,
+                {cls.Status.CONFIRMED: -1},
+            )
             return ReservationWithRelations.model_validate(
                 reservation_found.dict(), from_attributes=True
             )
         except Exception as e:
             raise e
 
+    @classmethod
+    async def sweep_expired_holds(
+        cls,
+        session: AsyncSession,
+        redis_client: RedisClient,
+        batch_size: int,
+    ) -> int:
+        """
+        Delete one batch of HELD reservations older than HELD_STATUS_TIMER and free their seats.
+
+        Rows locked by a concurrent confirmation or sweeper are skipped.
+
+        returns:
+            Number of reclaimed holds
+        """
+        expired_before = datetime.now(tz=timezone.utc) - timedelta(
+            seconds=settings.HELD_STATUS_TIMER
+        )
+        expired_holds = (
+            select(cls.model.id)
+            .where(
+                cls.model.status == cls.Status.HELD,
+                cls.model.reserved_at < expired_before,
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(
+            delete(cls.model)
+            .where(cls.model.id.in_(expired_holds.scalar_subquery()))
+            .returning(cls.model.show_time_id, cls.model.seat_id)
+        )
+        released = result.all()
+        await session.commit()
+
+        released_seats: dict[int, list[int]] = defaultdict(list)
+        for showtime_id, seat_id in released:
+            released_seats[showtime_id].append(seat_id)
+
+        for showtime_id, seat_ids in released_seats.items():
+            await SeatMap.mark(
+                session, redis_client, showtime_id, seat_ids, booked=False
+            )
+            await ShowtimeCounter.increment(
+                redis_client, showtime_id, {cls.Status.HELD: -len(seat_ids)}
+            )
+
+        return len(released)
+
+    @classmethod
+    async def complete_showtimes(
+        cls, session: AsyncSession, showtime_ids: list[int], now: datetime
+    ) -> dict[str, int]:
+        """
+        Settle the CONFIRMED reservations of showtimes in a single pass, without committing.
+
+        Showtimes without attendance scans complete all their reservations, showtimes with scans complete the
+        scanned reservations and mark the others as NO_SHOW. The scans of these showtimes are deleted afterwards.
+
+        Paid reservations are moved in the revenue rollups as well.
+
+        returns:
+            Number of settled reservations per new status
+        """
+        if not showtime_ids:
+            return {}
+
+        scans = AttendanceScanModel
+        has_scans = exists().where(scans.show_time_id == cls.model.show_time_id)
+        is_scanned = exists().where(
+            scans.show_time_id == cls.model.show_time_id,
+            scans.reservation_id == cls.model.id,
+        )
+        settled = (
+            update(cls.model)
+            .where(
+                cls.model.show_time_id.in_(showtime_ids),
+                cls.model.status == cls.Status.CONFIRMED,
+            )
+            .values(
+                status=case(
+                    (is_scanned, cls.Status.COMPLETE),
+                    (has_scans, cls.Status.NO_SHOW),
+                    else_=cls.Status.COMPLETE,
+                ),
+                updated_at=now,
+            )
+            .returning(
+                cls.model.show_time_id,
+                cls.model.status,
+                cls.model.is_paid,
+                cls.model.final_price,
+            )
+            .cte("settled")
+        )
+        result = await session.execute(
+            select(
+                settled.c.show_time_id,
+                settled.c.status,
+                func.count(),
+                func.count().filter(settled.c.is_paid),
+                func.coalesce(
+                    func.sum(settled.c.final_price).filter(settled.c.is_paid), 0
+                ),
+            ).group_by(settled.c.show_time_id, settled.c.status)
+        )
+
+        counts: dict[str, int] = defaultdict(int)
+        deltas = []
+        for showtime_id, status, settled_count, paid, revenue in result.all():
+            counts[status] += settled_count
+            if paid:
+                deltas.extend(
+                    RevenueRollup.move(
+                        showtime_id,
+                        revenue,
+                        from_status=cls.Status.CONFIRMED,
+                        to_status=status,
+                        tickets=paid,
+                    )
+                )
+        await RevenueRollup.apply(session, deltas)
+
+        await session.execute(
+            delete(scans).where(scans.show_time_id.in_(showtime_ids))
+        )
+        return dict(counts)
+
+    @classmethod
+    async def complete_ended_showtimes(
+        cls, session: AsyncSession, batch_size: int
+    ) -> tuple[list[int], dict[str, int]]:
+        """
+        Mark one batch of showtimes ended OFFSET_DELAY_MINUTES ago as processed, and settle their CONFIRMED
+        reservations, see 'complete_showtimes', in a single transaction.
+
+        Showtimes locked by a concurrent run are skipped, so several workers never process the same showtime.
+
+        returns:
+            Ids of the processed showtimes and the number of settled reservations per new status
+        """
+        now = datetime.now(tz=timezone.utc)
+        ended_before = now - timedelta(minutes=settings.OFFSET_DELAY_MINUTES)
+        ended_showtimes = (
+            select(Showtime.model.id)
+            .where(
+                Showtime.model.is_processed_for_completion == False,  # noqa: E712
+                Showtime.model.end_at < ended_before,
+            )
+            .order_by(Showtime.model.end_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .subquery()
+        )
+        result = await session.execute(
+            update(Showtime.model)
+            .where(Showtime.model.id == ended_showtimes.c.id)
+            .values(is_processed_for_completion=True, updated_at=now)
+            .returning(Showtime.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        showtime_ids = list(result.scalars())
+
+        counts = await cls.complete_showtimes(session, showtime_ids, now)
+
+        await session.commit()
+        return showtime_ids, counts
+
+    @classmethod
+    async def complete_showtime(
+        cls, session: AsyncSession, showtime_id: int, redis_client: RedisClient
+    ) -> dict[str, int]:
+        """
+        Settle the reservations of a showtime that started already, without waiting for the completion job.
+
+        Raises:
+            BadRequestException: if the showtime did not start or is already completed
+        """
+        now = datetime.now(tz=timezone.utc)
+        result = await session.execute(
+            update(Showtime.model)
+            .where(
+                Showtime.model.id == showtime_id,
+                Showtime.model.is_processed_for_completion == False,  # noqa: E712
+                Showtime.model.start_at <= now,
+            )
+            .values(is_processed_for_completion=True, updated_at=now)
+            .returning(Showtime.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar() is None:
+            await session.rollback()
+            raise BadRequestException("Showtime did not start or is already completed")
+
+        counts = await cls.complete_showtimes(session, [showtime_id], now)
+        await session.commit()
+
+        await ShowtimeCounter.forget(redis_client, [showtime_id])
+        return counts
+
+    @classmethod
+    def get_export_statement(cls, query: ReservationBase.Export) -> Select:
+        """Reservation columns matching the filters of the export, ordered by its sort then by id"""
+        return (
+            select(*cls.get_projection())
+            .where(*query.filter_fields)
+            .order_by(*query.sort_fields, cls.model.id)
+        )
+
     @classmethod
     async def get_all_with_relations(
         cls,
@@ -170,6 +596,7 @@ class Reservation(ReservationBase):
         limit=20,
         options=None,
         return_as_base=False,
+        trusted=None,
     ):
         return await ReservationWithRelations.get_all(
             session,
@@ -179,4 +606,5 @@ class Reservation(ReservationBase):
             limit=limit,
             options=options,
             return_as_base=return_as_base,
+            trusted=trusted,
         )
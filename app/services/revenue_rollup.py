@@ -0,0 +1,224 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Float,
+    Integer,
+    String,
+    cast,
+    column,
+    exists,
+    func,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domain.showtime import ShowtimeBase as Showtime
+from app.models import Reservation as ReservationModel, RevenueRollup as RevenueRollupModel
+
+type RevenueDelta = tuple[int, str, int, float]  # show_time_id, status, tickets, revenue
+type RollupKey = tuple[int, int, date]  # movie_id, theatre_id, show_date
+
+
+class RevenueRollup:
+    """
+    Incrementally maintained revenue per movie, theatre, showtime date and reservation status.
+
+    Only paid reservations are counted, every transition of a paid reservation moves its ticket and price from the
+    old status to the new one with 'apply', in the transaction of the transition.
+    """
+
+    model = RevenueRollupModel
+
+    @classmethod
+    def show_date(cls):
+        return cast(
+            func.timezone(settings.REPORTING_TIMEZONE, Showtime.model.start_at), Date
+        )
+
+    @classmethod
+    def move(
+        cls,
+        showtime_id: int,
+        price: Optional[float],
+        /,
+        *,
+        from_status: Optional[str] = None,
+        to_status: Optional[str] = None,
+        tickets: int = 1,
+    ) -> list[RevenueDelta]:
+        """Deltas of 'tickets' paid tickets of a showtime going from a status to another"""
+        revenue = price or 0.0
+        deltas = []
+        if from_status is not None:
+            deltas.append((showtime_id, from_status, -tickets, -revenue))
+        if to_status is not None:
+            deltas.append((showtime_id, to_status, tickets, revenue))
+        return deltas
+
+    @classmethod
+    async def apply(cls, session: AsyncSession, deltas: list[RevenueDelta]) -> None:
+        """Add the deltas to the rollups of their showtimes in a single upsert, without committing"""
+        if not deltas:
+            return
+
+        changes = values(
+            column("show_time_id", Integer),
+            column("status", String),
+            column("tickets", Integer),
+            column("revenue", Float),
+            name="changes",
+        ).data(deltas)
+
+        show_date = cls.show_date()
+        # deltas of showtimes sharing a key must be summed, an upsert cannot change a row twice
+        summed = (
+            select(
+                Showtime.model.movie_id,
+                Showtime.model.theatre_id,
+                show_date,
+                changes.c.status,
+                func.sum(changes.c.tickets),
+                func.sum(changes.c.revenue),
+            )
+            .join(changes, changes.c.show_time_id == Showtime.model.id)
+            .group_by(
+                Showtime.model.movie_id,
+                Showtime.model.theatre_id,
+                show_date,
+                changes.c.status,
+            )
+        )
+
+        statement = insert(cls.model).from_select(
+            ["movie_id", "theatre_id", "show_date", "status", "tickets", "revenue"],
+            summed,
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="uc_revenue_rollup",
+            set_={
+                "tickets": cls.model.tickets + statement.excluded.tickets,
+                "revenue": cls.model.revenue + statement.excluded.revenue,
+                "updated_at": func.now(),
+            },
+        )
+        await session.execute(statement)
+
+    @classmethod
+    async def get_keys(
+        cls, session: AsyncSession, where_clause: list[ColumnElement[bool]]
+    ) -> set[RollupKey]:
+        """Rollup keys of the showtimes matching 'where_clause'"""
+        result = await session.execute(
+            select(
+                Showtime.model.movie_id, Showtime.model.theatre_id, cls.show_date()
+            ).where(*where_clause)
+        )
+        return {tuple(row) for row in result}
+
+    @classmethod
+    async def rebuild(
+        cls, session: AsyncSession, showtime_ids: Optional[list[int]] = None
+    ) -> None:
+        """Recompute the rollups of the keys of the showtimes, or of the whole table, without committing"""
+        keys = None
+        if showtime_ids is not None:
+            keys = await cls.get_keys(session, [Showtime.model.id.in_(showtime_ids)])
+        await cls.rebuild_keys(session, keys)
+
+    @classmethod
+    async def rebuild_keys(
+        cls, session: AsyncSession, keys: Optional[set[RollupKey]] = None
+    ) -> None:
+        """
+        Recompute the rollups of the keys, or of the whole table, from the paid reservations, without committing.
+
+        The table is locked against transitions until the transaction ends, a transition either committed its
+        reservation before the recount and is counted, or applies its delta after it.
+        """
+        if keys is not None and not keys:
+            return
+
+        await session.execute(
+            text(f"LOCK TABLE {cls.model.__tablename__} IN SHARE ROW EXCLUSIVE MODE")
+        )
+
+        show_date = cls.show_date()
+        key_columns = (Showtime.model.movie_id, Showtime.model.theatre_id, show_date)
+        totals = (
+            select(
+                *key_columns,
+                ReservationModel.status,
+                func.count(),
+                func.coalesce(func.sum(ReservationModel.final_price), 0.0),
+            )
+            .join(ReservationModel, ReservationModel.show_time_id == Showtime.model.id)
+            .where(ReservationModel.is_paid)
+            .group_by(*key_columns, ReservationModel.status)
+        )
+        if keys is not None:
+            totals = totals.where(tuple_(*key_columns).in_(keys))
+
+        statement = insert(cls.model).from_select(
+            ["movie_id", "theatre_id", "show_date", "status", "tickets", "revenue"],
+            totals,
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="uc_revenue_rollup",
+            set_={
+                "tickets": statement.excluded.tickets,
+                "revenue": statement.excluded.revenue,
+                "updated_at": func.now(),
+            },
+            where=or_(
+                cls.model.tickets != statement.excluded.tickets,
+                cls.model.revenue != statement.excluded.revenue,
+            ),
+        )
+        await session.execute(statement)
+
+        # rollups left without any paid reservation go back to zero
+        has_reservations = exists().where(
+            ReservationModel.show_time_id == Showtime.model.id,
+            ReservationModel.is_paid,
+            ReservationModel.status == cls.model.status,
+            Showtime.model.movie_id == cls.model.movie_id,
+            Showtime.model.theatre_id == cls.model.theatre_id,
+            show_date == cls.model.show_date,
+        )
+        stale = (
+            update(cls.model)
+            .where(or_(cls.model.tickets != 0, cls.model.revenue != 0), ~has_reservations)
+            .values(tickets=0, revenue=0.0, updated_at=func.now())
+        )
+        if keys is not None:
+            stale = stale.where(
+                tuple_(cls.model.movie_id, cls.model.theatre_id, cls.model.show_date).in_(keys)
+            )
+        await session.execute(stale)
+
+    @classmethod
+    def where_clause(
+        cls,
+        status: str,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        theatre_id: Optional[int] = None,
+    ) -> list:
+        where_clause = [cls.model.status == status]
+        if from_date is not None:
+            where_clause.append(cls.model.show_date >= from_date)
+        if to_date is not None:
+            where_clause.append(cls.model.show_date <= to_date)
+        if theatre_id is not None:
+            where_clause.append(cls.model.theatre_id == theatre_id)
+        return where_clause
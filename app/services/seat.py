@@ -1,13 +1,16 @@
 import logging
-from sqlalchemy import select
+import traceback
+from sqlalchemy import exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.pagination import PaginatedResult
 
-from app.domain.showtime import ShowtimeBase as Showtime
 from app.domain.seat import SeatBase
 from app.domain.reservation import ReservationBase as Reservation
 
+from app.redis import RedisClient
+from app.services.seat_map import SeatMap
+
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -20,28 +23,40 @@ class Seat(SeatBase):
         session: AsyncSession,
         showtime_id: int,
         pagination: SeatBase.SeatPagination,
+        redis_client: RedisClient,
     ) -> PaginatedResult[SeatBase]:
-        showtime = await Showtime.get_one(session, showtime_id, field=Showtime.model.id)
-
-        theatre_id = showtime.theatre_id
-
-        booked_statuses = [
-            Reservation.Status.HELD,
-            Reservation.Status.CONFIRMED,
-        ]
-
-        booked_seats_subquery = (
-            select(Reservation.model.seat_id)
-            .where(Reservation.model.show_time_id == showtime_id)
-            .where(Reservation.model.status.in_(booked_statuses))
+        theatre_id = await SeatMap.get_theatre_id(session, showtime_id)
+
+        # Plain seat map views are served from the occupancy bitmap,
+        # sorting and filtering still go through the database.
+        if not pagination.sort_by and not pagination.filter_by:
+            try:
+                available_seats = await SeatMap.get_available_seats(
+                    session, redis_client, showtime_id
+                )
+                start = (pagination.page - 1) * pagination.size
+                return PaginatedResult(
+                    result=available_seats[start : start + pagination.size],
+                    total_records=len(available_seats),
+                    size=pagination.size,
+                    page=pagination.page,
+                )
+            except Exception as e:
+                logger.error(
+                    f"[Seat]: Seat map unavailable for showtime: {showtime_id}, falling back to database: {e} {traceback.format_exc()}"
+                )
+
+        seat_is_booked = exists().where(
+            Reservation.model.seat_id == Seat.model.id,
+            Reservation.model.show_time_id == showtime_id,
+            Reservation.model.status.in_(SeatMap.BOOKED_STATUSES),
         )
-        reserved_seat_ids = await session.scalars(booked_seats_subquery)
 
         return await cls.get_all(
             session,
             pagination=pagination,
             where_clause=[
                 Seat.model.theatre_id == theatre_id,
-                Seat.model.id.not_in(reserved_seat_ids),
+                ~seat_is_booked,
             ],
         )
@@ -0,0 +1,109 @@
+from uuid import uuid4
+
+from app.core.config import settings
+from app.redis import RedisClient
+
+
+# KEYS: hold keys
+# ARGV[1]: ttl in ms, ARGV[2..n]: owner of each hold key
+ACQUIRE_HOLDS = """
+for i = 1, #KEYS do
+    local owner = redis.call('GET', KEYS[i])
+    if owner and owner ~= ARGV[i + 1] then
+        return 0
+    end
+end
+for i = 1, #KEYS do
+    redis.call('SET', KEYS[i], ARGV[i + 1], 'PX', ARGV[1])
+end
+return 1
+"""
+
+# KEYS[1]: hold key, KEYS[2]: release mark of the operation
+# ARGV[1]: owner of the hold key, ARGV[2]: operation id, ARGV[3]: seconds the release mark is kept
+# A call retried after a timeout finds the mark of its first run and reports the release again
+RELEASE_HOLD = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+if redis.call('GET', KEYS[2]) == ARGV[2] then
+    return 1
+end
+return 0
+"""
+
+# outlives every retry of a release by far
+RELEASE_OPERATION_TTL = 60
+
+
+class SeatHold:
+    """
+    Seat holds kept in redis with a native TTL of HELD_STATUS_TIMER.
+
+    A hold key per (showtime, seat) stores the id of the HELD reservation owning it, the HELD rows
+    of expired holds are reclaimed in batches by the 'sweep_expired_holds' job.
+    """
+
+    @classmethod
+    def get_cache_key(cls, showtime_id: int, seat_id: int):
+        return f"holds:{showtime_id}:{seat_id}"
+
+    @classmethod
+    def get_release_key(cls, showtime_id: int, seat_id: int, reservation_id: int):
+        return f"holds:{showtime_id}:{seat_id}:released:{reservation_id}"
+
+    @classmethod
+    async def acquire(
+        cls,
+        redis_client: RedisClient,
+        showtime_id: int,
+        reservations: dict[int, int],
+    ) -> bool:
+        """
+        Hold all passed seats or none of them.
+
+        Args:
+            - showtime_id: Showtime of the seats
+            - reservations: Maps each seat id to the id of the HELD reservation owning it
+
+        Returns:
+            True if all seats were held, False if any of them is held by another reservation
+        """
+        ttl_ms = settings.HELD_STATUS_TIMER * 1000
+
+        keys = [cls.get_cache_key(showtime_id, seat_id) for seat_id in reservations]
+        owners = [str(reservation_id) for reservation_id in reservations.values()]
+
+        result = await redis_client.run_script(
+            ACQUIRE_HOLDS,
+            keys,
+            [ttl_ms, *owners],
+        )
+        return result == 1
+
+    @classmethod
+    async def release(
+        cls,
+        redis_client: RedisClient,
+        showtime_id: int,
+        seat_id: int,
+        reservation_id: int,
+    ) -> bool:
+        """
+        Release a hold if it is still owned by the reservation.
+
+        Returns:
+            True if the hold was alive and released, False if it expired or belongs to another reservation
+        """
+        # the client retries commands failing with a timeout, the first run may already have released the hold
+        result = await redis_client.run_script(
+            RELEASE_HOLD,
+            [
+                cls.get_cache_key(showtime_id, seat_id),
+                cls.get_release_key(showtime_id, seat_id, reservation_id),
+            ],
+            [reservation_id, uuid4().hex, RELEASE_OPERATION_TTL],
+        )
+        return result == 1
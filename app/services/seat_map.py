@@ -0,0 +1,242 @@
+import logging
+import traceback
+from typing import ClassVar
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+from app.domain.seat import SeatBase
+from app.domain.showtime import ShowtimeBase as Showtime
+from app.domain.reservation import ReservationBase as Reservation
+
+from app.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+# Set bits only when the map exists, a missing map is rebuilt from the database on next read.
+# A rebuild running meanwhile may have read the seats before this change, its token is dropped so it does not store
+SET_BITS_IF_EXISTS = """
+redis.call('DEL', KEYS[2])
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 2, #ARGV do
+    redis.call('SETBIT', KEYS[1], ARGV[i], ARGV[1])
+end
+return 1
+"""
+
+# Store a rebuilt map only when no seat changed since the rebuild started, i.e. its token is still there
+SET_IF_BUILD_TOKEN = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3], 'NX')
+return 1
+"""
+
+
+class SeatMap:
+    """
+    Per-showtime seat occupancy bitmap kept in redis.
+
+    Bit `n` of the map is set when the seat at ordinal `n` of the theatre layout (seats ordered by id)
+    is either HELD or CONFIRMED for the showtime. Theatre layouts are kept in process after the first load.
+    A showtime only moves to another theatre while it has no reservations, see 'Showtime.update_one', its theatre is
+    kept in process for SEAT_MAP_THEATRE_CACHE_TTL seconds and its map is dropped with 'forget' on a move.
+    """
+
+    _layouts: ClassVar[dict[int, list[SeatBase]]] = {}
+    _ordinals: ClassVar[dict[int, dict[int, int]]] = {}
+    _showtime_theatres: ClassVar[TTLCache[int]] = TTLCache(
+        maxsize=settings.SEAT_MAP_THEATRE_CACHE_SIZE,
+        ttl=settings.SEAT_MAP_THEATRE_CACHE_TTL,
+    )
+
+    BOOKED_STATUSES: ClassVar[list[Reservation.Status]] = [
+        Reservation.Status.HELD,
+        Reservation.Status.CONFIRMED,
+    ]
+
+    @classmethod
+    def get_cache_key(cls, showtime_id: int):
+        return f"showtimes:{showtime_id}:seatmap"
+
+    @classmethod
+    def get_build_key(cls, showtime_id: int):
+        return f"showtimes:{showtime_id}:seatmap:build"
+
+    @classmethod
+    async def get_theatre_id(cls, session: AsyncSession, showtime_id: int) -> int:
+        theatre_id = cls._showtime_theatres.get(showtime_id)
+        if theatre_id is None:
+            showtime = await Showtime.get_one(
+                session, showtime_id, field=Showtime.model.id
+            )
+            theatre_id = showtime.theatre_id
+            cls._showtime_theatres.set(showtime_id, theatre_id)
+
+        return theatre_id
+
+    @classmethod
+    async def get_layout(cls, session: AsyncSession, theatre_id: int) -> list[SeatBase]:
+        layout = cls._layouts.get(theatre_id)
+        if layout is None:
+            layout = await SeatBase.get_all(
+                session,
+                where_clause=[SeatBase.model.theatre_id == theatre_id],
+                order_clause=[SeatBase.model.id],
+                limit=None,
+            )
+            cls._layouts[theatre_id] = layout
+            cls._ordinals[theatre_id] = {
+                seat.id: ordinal for ordinal, seat in enumerate(layout)
+            }
+
+        return layout
+
+    @classmethod
+    async def get_ordinals(
+        cls, session: AsyncSession, theatre_id: int
+    ) -> dict[int, int]:
+        await cls.get_layout(session, theatre_id)
+        return cls._ordinals[theatre_id]
+
+    @classmethod
+    async def get_seats(
+        cls, session: AsyncSession, theatre_id: int, seat_ids: list[int]
+    ) -> dict[int, SeatBase]:
+        """Get seats of a theatre by id from the cached layout, unknown seat ids are left out"""
+        layout = await cls.get_layout(session, theatre_id)
+        ordinals = cls._ordinals[theatre_id]
+
+        return {
+            seat_id: layout[ordinals[seat_id]]
+            for seat_id in seat_ids
+            if seat_id in ordinals
+        }
+
+    @classmethod
+    async def _build(
+        cls,
+        session: AsyncSession,
+        redis_client: RedisClient,
+        showtime_id: int,
+        ordinals: dict[int, int],
+    ) -> bytes:
+        """
+        Build the bitmap from the database and store it unless another process already did.
+
+        The build token is written before reading the seats, a change marked in between drops it and the
+        bitmap is returned without being stored.
+        """
+        token = uuid4().hex
+        await redis_client.set(
+            cls.get_build_key(showtime_id), token, ex=settings.SEAT_MAP_BUILD_TTL
+        )
+
+        booked_seat_ids = await session.scalars(
+            select(Reservation.model.seat_id).where(
+                Reservation.model.show_time_id == showtime_id,
+                Reservation.model.status.in_(cls.BOOKED_STATUSES),
+            )
+        )
+        # one extra byte so the stored value is never empty
+        bitmap = bytearray(len(ordinals) // 8 + 1)
+        for seat_id in booked_seat_ids:
+            ordinal = ordinals.get(seat_id)
+            if ordinal is None:
+                continue
+            bitmap[ordinal >> 3] |= 0x80 >> (ordinal & 7)
+
+        bitmap = bytes(bitmap)
+        try:
+            await redis_client.run_script(
+                SET_IF_BUILD_TOKEN,
+                [cls.get_cache_key(showtime_id), cls.get_build_key(showtime_id)],
+                [token, bitmap, settings.SEAT_MAP_TTL],
+            )
+        except Exception as e:
+            logger.error(
+                f"[SeatMap]: Failed to store seat map of showtime: {showtime_id}: {e} {traceback.format_exc()}"
+            )
+        return bitmap
+
+    @classmethod
+    async def get_available_seats(
+        cls, session: AsyncSession, redis_client: RedisClient, showtime_id: int
+    ) -> list[SeatBase]:
+        """Get the seats of a showtime that are neither HELD nor CONFIRMED"""
+        theatre_id = await cls.get_theatre_id(session, showtime_id)
+        layout = await cls.get_layout(session, theatre_id)
+
+        bitmap = await redis_client.get_bytes(cls.get_cache_key(showtime_id))
+        if bitmap is None:
+            bitmap = await cls._build(
+                session, redis_client, showtime_id, cls._ordinals[theatre_id]
+            )
+
+        available = []
+        for ordinal, seat in enumerate(layout):
+            index = ordinal >> 3
+            if index < len(bitmap) and bitmap[index] & (0x80 >> (ordinal & 7)):
+                continue
+            available.append(seat)
+
+        return available
+
+    @classmethod
+    async def mark(
+        cls,
+        session: AsyncSession,
+        redis_client: RedisClient,
+        showtime_id: int,
+        seat_ids: list[int],
+        /,
+        *,
+        booked: bool,
+    ) -> None:
+        """
+        Flip the bits of the passed seats, must be called after the reservation change is committed.
+
+        Failures are logged only, the database stays the source of truth and the map expires after SEAT_MAP_TTL.
+        """
+        try:
+            theatre_id = await cls.get_theatre_id(session, showtime_id)
+            ordinals = await cls.get_ordinals(session, theatre_id)
+
+            seat_ordinals = [
+                ordinals[seat_id] for seat_id in seat_ids if seat_id in ordinals
+            ]
+            if not seat_ordinals:
+                return
+
+            await redis_client.run_script(
+                SET_BITS_IF_EXISTS,
+                [cls.get_cache_key(showtime_id), cls.get_build_key(showtime_id)],
+                [1 if booked else 0, *seat_ordinals],
+            )
+        except Exception as e:
+            logger.error(
+                f"[SeatMap]: Failed to update seat map of showtime: {showtime_id}: {e} {traceback.format_exc()}"
+            )
+
+    @classmethod
+    async def forget(cls, redis_client: RedisClient, showtime_id: int) -> None:
+        """Drop the map of a showtime that moved to another theatre, must be called after the move is committed"""
+        cls._showtime_theatres.delete(showtime_id)
+        try:
+            await redis_client.delete(
+                cls.get_cache_key(showtime_id), cls.get_build_key(showtime_id)
+            )
+        except Exception as e:
+            logger.error(
+                f"[SeatMap]: Failed to drop seat map of showtime: {showtime_id}: {e} {traceback.format_exc()}"
+            )
@@ -1,8 +1,19 @@
+from typing import Any, ClassVar
+
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql.elements import ColumnElement
 
+from app.core.exceptions import BadRequestException
+from app.core.response_cache import ResponseCache
+
 from app.domain.showtime import ShowtimeBase, ShowtimeDetails
 from app.domain.reservation import ReservationBase as Reservation
+from app.redis import RedisClient, get_redis_client
+from app.services.revenue_rollup import RevenueRollup
+from app.services.seat_map import SeatMap
+from app.services.showtime_counter import ShowtimeCounter
 
 from app.dto.showtime import ShowtimeCreateDto, ShowtimeUpdateDto
 
@@ -13,25 +24,29 @@ logger.setLevel(logging.INFO)
 
 
 class Showtime(ShowtimeBase):
+    CACHE_TAG: ClassVar[str] = "showtimes"
+
+    @classmethod
+    def get_cache_tag(cls, showtime_id: int):
+        return f"showtimes:{showtime_id}"
+
+    @classmethod
+    async def invalidate_cache(cls, showtime_id: int) -> None:
+        await ResponseCache.invalidate(cls.CACHE_TAG, cls.get_cache_tag(showtime_id))
+
     @classmethod
     async def get_one_with_capacity(
-        cls, session: AsyncSession, showtime_id: int
+        cls, session: AsyncSession, showtime_id: int, redis_client: RedisClient
     ) -> ShowtimeDetails:
         found_showtime = await ShowtimeDetails.get_one(
             session,
             showtime_id,
         )
 
-        all_confirmed_reservations = await Reservation.get_all(
-            session,
-            where_clause=[
-                Reservation.model.show_time_id == showtime_id,
-                Reservation.model.status == Reservation.Status.CONFIRMED,
-            ],
-        )
+        counts = await ShowtimeCounter.get_counts(session, redis_client, showtime_id)
 
-        current_capcity = found_showtime.theatre.capacity - len(
-            all_confirmed_reservations
+        current_capcity = (
+            found_showtime.theatre.capacity - counts[Reservation.Status.CONFIRMED]
         )
 
         found_showtime.seats_available = current_capcity
@@ -51,13 +66,52 @@ class Showtime(ShowtimeBase):
     ) -> ShowtimeBase:
         try:
             await cls.validate_showtime(session, data)
+
+            moved_showtime_ids = []
+            if where_clause:
+                moved_showtime_ids = list(
+                    await session.scalars(
+                        select(cls.model.id).where(
+                            *where_clause, cls.model.theatre_id != data.theatre_id
+                        )
+                    )
+                )
+            # seats of reservations belong to the layout of the theatre, the seat map is keyed by its ordinals
+            if moved_showtime_ids and await session.scalar(
+                select(
+                    exists().where(
+                        Reservation.model.show_time_id.in_(moved_showtime_ids)
+                    )
+                )
+            ):
+                raise BadRequestException(
+                    "Cannot move a showtime with reservations to another theatre"
+                )
+
+            # the rollups of paid reservations are keyed by movie, theatre and date of the showtime
+            old_keys = (
+                await RevenueRollup.get_keys(session, where_clause) if where_clause else set()
+            )
             data = await super().update_one(
                 session,
                 data,
                 where_clause=where_clause,
-                commit=commit,
+                commit=False,
                 return_as_base=return_as_base,
             )
+            if data:
+                new_keys = await RevenueRollup.get_keys(
+                    session, [cls.model.id == data.id]
+                )
+                if new_keys != old_keys:
+                    await RevenueRollup.rebuild_keys(session, old_keys | new_keys)
+
+            if commit:
+                await session.commit()
+                if data:
+                    await cls.invalidate_cache(data.id)
+                for showtime_id in moved_showtime_ids:
+                    await SeatMap.forget(get_redis_client(), showtime_id)
             return data
         except Exception as e:
             raise e
@@ -82,6 +136,35 @@ class Showtime(ShowtimeBase):
                 return_as_base=return_as_base,
                 exclude_relations=exclude_relations,
             )
+            if commit:
+                await cls.invalidate_cache(data.id)
             return data
         except Exception as e:
             raise e
+
+    @classmethod
+    async def delete_one(
+        cls,
+        session: AsyncSession,
+        val: Any,
+        /,
+        *,
+        field: InstrumentedAttribute | None = None,
+        where_clause: list[ColumnElement[bool]] = None,
+        commit: bool = True,
+        return_as_base: bool = False,
+    ):
+        try:
+            deleted_showtime = await super().delete_one(
+                session,
+                val,
+                field=field,
+                where_clause=where_clause,
+                commit=commit,
+                return_as_base=return_as_base,
+            )
+            if deleted_showtime and commit:
+                await cls.invalidate_cache(deleted_showtime.id)
+            return deleted_showtime
+        except Exception as e:
+            raise e
@@ -0,0 +1,207 @@
+import logging
+import traceback
+from uuid import uuid4
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+from app.domain.reservation import ReservationBase as Reservation
+
+from app.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+# Increment only when the counters exist, missing counters are recounted from the database on next read.
+# KEYS[2] marks the operation as applied, a call retried after a timeout increments at most once
+# ARGV[1]: seconds the operation mark is kept, ARGV[2..n]: field and change pairs
+INCREMENT_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+if not redis.call('SET', KEYS[2], 1, 'NX', 'EX', ARGV[1]) then
+    return 0
+end
+for i = 2, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+# outlives every retry of an increment by far
+INCREMENT_OPERATION_TTL = 60
+
+# ARGV[1]: ttl in seconds, ARGV[2..n]: field and value pairs
+# ARGV[2] is 1 to overwrite existing counters, 0 to keep them
+SET_COUNTERS = """
+if ARGV[2] == '0' and redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class ShowtimeCounter:
+    """
+    Per-showtime counts of HELD and CONFIRMED reservations kept in a redis hash.
+
+    Reservation state changes increment the counters after their commit, and the
+    'reconcile_showtime_counters' job recounts them from the database to fix any drift.
+    """
+
+    COUNTED_STATUSES = [Reservation.Status.HELD, Reservation.Status.CONFIRMED]
+
+    @classmethod
+    def get_cache_key(cls, showtime_id: int):
+        return f"showtimes:{showtime_id}:counts"
+
+    @classmethod
+    def get_operation_key(cls, showtime_id: int, operation_id: str):
+        return f"showtimes:{showtime_id}:counts:ops:{operation_id}"
+
+    @classmethod
+    async def count_from_database(
+        cls, session: AsyncSession, showtime_ids: list[int]
+    ) -> dict[int, dict[str, int]]:
+        """Count HELD and CONFIRMED reservations of the passed showtimes with a single GROUP BY"""
+        counts: dict[int, dict[str, int]] = {
+            showtime_id: {status: 0 for status in cls.COUNTED_STATUSES}
+            for showtime_id in showtime_ids
+        }
+        if not showtime_ids:
+            return counts
+
+        result = await session.execute(
+            select(
+                Reservation.model.show_time_id,
+                Reservation.model.status,
+                func.count(),
+            )
+            .where(
+                Reservation.model.show_time_id.in_(showtime_ids),
+                Reservation.model.status.in_(cls.COUNTED_STATUSES),
+            )
+            .group_by(Reservation.model.show_time_id, Reservation.model.status)
+        )
+
+        for showtime_id, status, count in result.all():
+            counts[showtime_id][status] = count
+
+        return counts
+
+    @classmethod
+    def _store_args(
+        cls, showtime_id: int, counts: dict[str, int], overwrite: bool
+    ) -> tuple[list[str], list]:
+        fields = []
+        for status, count in counts.items():
+            fields.extend([str(status), count])
+
+        return (
+            [cls.get_cache_key(showtime_id)],
+            [settings.SHOWTIME_COUNTER_TTL, 1 if overwrite else 0, *fields],
+        )
+
+    @classmethod
+    async def store(
+        cls,
+        redis_client: RedisClient,
+        showtime_id: int,
+        counts: dict[str, int],
+        /,
+        *,
+        overwrite: bool,
+    ) -> None:
+        await redis_client.run_script(
+            SET_COUNTERS, *cls._store_args(showtime_id, counts, overwrite)
+        )
+
+    @classmethod
+    async def get_counts(
+        cls, session: AsyncSession, redis_client: RedisClient, showtime_id: int
+    ) -> dict[str, int]:
+        """Get the HELD and CONFIRMED counts of a showtime, recounting them when missing"""
+        try:
+            counts = await redis_client.hgetall(cls.get_cache_key(showtime_id))
+            if counts:
+                return {
+                    status: int(counts.get(status, 0))
+                    for status in cls.COUNTED_STATUSES
+                }
+        except Exception as e:
+            logger.error(
+                f"[ShowtimeCounter]: Failed to read counters of showtime: {showtime_id}: {e} {traceback.format_exc()}"
+            )
+            return (await cls.count_from_database(session, [showtime_id]))[showtime_id]
+
+        counts = (await cls.count_from_database(session, [showtime_id]))[showtime_id]
+        try:
+            await cls.store(redis_client, showtime_id, counts, overwrite=False)
+        except Exception as e:
+            logger.error(
+                f"[ShowtimeCounter]: Failed to store counters of showtime: {showtime_id}: {e} {traceback.format_exc()}"
+            )
+
+        return counts
+
+    @classmethod
+    async def increment(
+        cls,
+        redis_client: RedisClient,
+        showtime_id: int,
+        changes: dict[str, int],
+    ) -> None:
+        """
+        Apply count changes of a showtime, must be called after the reservation change is committed.
+
+        Failures are logged only, the counters are fixed by the next reconciliation.
+        """
+        try:
+            fields = []
+            for status, change in changes.items():
+                fields.extend([str(status), change])
+
+            # the client retries commands failing with a timeout, the script may already have run
+            operation_key = cls.get_operation_key(showtime_id, uuid4().hex)
+            await redis_client.run_script(
+                INCREMENT_IF_EXISTS,
+                [cls.get_cache_key(showtime_id), operation_key],
+                [INCREMENT_OPERATION_TTL, *fields],
+            )
+        except Exception as e:
+            logger.error(
+                f"[ShowtimeCounter]: Failed to update counters of showtime: {showtime_id}: {e} {traceback.format_exc()}"
+            )
+
+    @classmethod
+    async def reconcile(
+        cls,
+        session: AsyncSession,
+        redis_client: RedisClient,
+        showtime_ids: list[int],
+    ) -> None:
+        """Overwrite the counters of the passed showtimes with the counts in the database, in a single round trip"""
+        counts = await cls.count_from_database(session, showtime_ids)
+        if not counts:
+            return
+
+        async with redis_client.batch() as batch:
+            for showtime_id, showtime_counts in counts.items():
+                await batch.run_script(
+                    SET_COUNTERS,
+                    *cls._store_args(showtime_id, showtime_counts, overwrite=True),
+                )
+
+    @classmethod
+    async def forget(cls, redis_client: RedisClient, showtime_ids: list[int]) -> None:
+        """Drop the counters of showtimes that do not take reservations anymore"""
+        if showtime_ids:
+            await redis_client.delete(
+                *[cls.get_cache_key(showtime_id) for showtime_id in showtime_ids]
+            )
+
@@ -1,8 +1,13 @@
 import logging
 import traceback
+from typing import Any
 
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+from sqlalchemy.sql.elements import ColumnElement
 
 from fastapi import HTTPException, status
 
@@ -14,18 +19,17 @@ from app.domain.user import UserBase
 from app.dto.user import SigninResult, SignupRequest, UserCredentials, UserCreate
 
 from app.core.auth.jwt import JwtAuth
+from app.core.auth.password import password_hasher
+from app.core.auth.principal import UserPrincipalCache
+from app.core.exceptions import UnauthorizedException
 from app.core.auth.schema import JwtPayload
 from app.core.auth.cookie import cookie_signer
 
 from app.models import User as UserModel
 
-from pwdlib import PasswordHash
-
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-password_hash = PasswordHash.recommended()
-
 
 class UserAuth(UserBase):
     role: Role
@@ -54,7 +58,7 @@ class UserAuth(UserBase):
                     email=signup_data.email,
                     age=signup_data.age,
                     role_id=regular_user_role.id,
-                    hashed_password=password_hash.hash(signup_data.password),
+                    hashed_password=await password_hasher.hash(signup_data.password),
                 ),
             )
             return created_user
@@ -67,12 +71,21 @@ class UserAuth(UserBase):
         cls, session: AsyncSession, credentials: UserCredentials
     ) -> SigninResult:
         try:
-            user_found = await cls.get_one(
+            user_found: UserModel | None = await cls.get_one(
                 session,
                 credentials.email,
                 field=cls.model.email,
                 options=[selectinload(UserModel.role)],
+                return_as_base=True,
+                raise_not_found=False,
+            )
+            is_verified = await password_hasher.verify(
+                credentials.password,
+                user_found.hashed_password if user_found else None,
             )
+            if not is_verified:
+                raise UnauthorizedException("Invalid email or password")
+
             payload_data = JwtPayload(
                 id=user_found.id, email=user_found.email, role=user_found.role.role_name
             )
@@ -82,3 +95,59 @@ class UserAuth(UserBase):
         except Exception as e:
             logger.info(f"[UserAuth]: Failed to login: {e} {traceback.format_exc()}")
             raise e
+
+    @classmethod
+    async def update_one(
+        cls,
+        session: AsyncSession,
+        data: BaseModel | dict,
+        /,
+        *,
+        where_clause: list[ColumnElement[bool]] | None = None,
+        commit: bool = True,
+        return_as_base: bool = False,
+        options: list[_AbstractLoad] | None = None,
+    ):
+        """Update a user and drop its cached principal, with 'commit=False' invalidate again after committing"""
+        try:
+            updated_user = await super().update_one(
+                session,
+                data,
+                where_clause=where_clause,
+                commit=commit,
+                return_as_base=return_as_base,
+                options=options,
+            )
+            if updated_user:
+                await UserPrincipalCache.invalidate(updated_user.id)
+            return updated_user
+        except Exception as e:
+            raise e
+
+    @classmethod
+    async def delete_one(
+        cls,
+        session: AsyncSession,
+        val: Any,
+        /,
+        *,
+        field: InstrumentedAttribute | None = None,
+        where_clause: list[ColumnElement[bool]] = None,
+        commit: bool = True,
+        return_as_base: bool = False,
+    ):
+        """Delete a user and drop its cached principal, so its tokens stop resolving"""
+        try:
+            deleted_user = await super().delete_one(
+                session,
+                val,
+                field=field,
+                where_clause=where_clause,
+                commit=commit,
+                return_as_base=return_as_base,
+            )
+            if deleted_user:
+                await UserPrincipalCache.invalidate(deleted_user.id)
+            return deleted_user
+        except Exception as e:
+            raise e